@@ -310,7 +310,24 @@ class SQLiteClient:
         self._init_lock_timeout_seconds = max(
             0.0, float(os.getenv("DB_INIT_LOCK_TIMEOUT_SEC", "30") or "30")
         )
-        self.engine = create_async_engine(database_url, echo=False)
+        # SQLAlchemy caches compiled statements per engine and sqlite3 keeps an
+        # LRU of prepared statements per connection; size both for the fixed
+        # set of hot queries instead of relying on the library defaults.
+        # Negative values are treated as invalid rather than as "disable".
+        self._query_cache_size = self._env_int("DB_QUERY_CACHE_SIZE", 1200)
+        if self._query_cache_size < 0:
+            self._query_cache_size = 1200
+        self._sqlite_statement_cache_size = self._env_int(
+            "DB_SQLITE_STATEMENT_CACHE_SIZE", 256
+        )
+        if self._sqlite_statement_cache_size < 0:
+            self._sqlite_statement_cache_size = 256
+        self.engine = create_async_engine(
+            database_url,
+            echo=False,
+            query_cache_size=self._query_cache_size,
+            connect_args={"cached_statements": self._sqlite_statement_cache_size},
+        )
         self._runtime_write_wal_enabled = self._env_bool("RUNTIME_WRITE_WAL_ENABLED", False)
         self._runtime_write_journal_mode_requested = (
             self._normalize_runtime_write_journal_mode(
@@ -2735,10 +2752,15 @@ class SQLiteClient:
         if not raw_ids:
             return normalized_ids
         for item in raw_ids:
-            try:
-                parsed = int(item)
-            except (TypeError, ValueError):
-                continue
+            # Plain ints are the common case; skip the int() call and the
+            # exception frame setup for them.
+            if type(item) is int:
+                parsed = item
+            else:
+                try:
+                    parsed = int(item)
+                except (TypeError, ValueError):
+                    continue
             if parsed <= 0 or parsed in seen_ids:
                 continue
             seen_ids.add(parsed)
@@ -3521,65 +3543,152 @@ class SQLiteClient:
             Created memory info with full path
         """
         async with self.session() as session:
-            # Validate parent exists (if specified)
-            if parent_path:
-                parent_exists = await session.execute(
-                    select(Path)
-                    .where(Path.domain == domain)
-                    .where(Path.path == parent_path)
+            return await self._create_memory_in_session(
+                session,
+                parent_path=parent_path,
+                content=content,
+                priority=priority,
+                title=title,
+                disclosure=disclosure,
+                domain=domain,
+                index_now=index_now,
+            )
+
+    _CREATE_MEMORY_ENTRY_KEYS = frozenset(
+        {
+            "parent_path",
+            "content",
+            "priority",
+            "title",
+            "disclosure",
+            "domain",
+            "index_now",
+        }
+    )
+
+    async def create_memories_bulk(
+        self,
+        entries: Sequence[Mapping[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several memories in a single transaction.
+
+        Each entry takes the same keyword arguments as ``create_memory``;
+        any other key raises ``ValueError`` before the transaction opens.
+        Entries are applied in order, so a later entry may use an earlier
+        one as its parent. Any failure rolls back the whole batch.
+
+        Returns:
+            Created memory info for each entry, in input order
+        """
+        allowed_keys = self._CREATE_MEMORY_ENTRY_KEYS
+        for position, entry in enumerate(entries):
+            unknown_keys = sorted(set(entry) - allowed_keys)
+            if unknown_keys:
+                raise ValueError(
+                    f"create_memories_bulk entry {position} has unsupported "
+                    f"keys: {', '.join(unknown_keys)}"
                 )
-                if not parent_exists.scalar_one_or_none():
-                    raise ValueError(
-                        f"Parent '{domain}://{parent_path}' does not exist. "
-                        f"Create the parent first, or use '{domain}://' as root."
+            missing_keys = sorted(
+                {"parent_path", "content", "priority"} - set(entry)
+            )
+            if missing_keys:
+                raise ValueError(
+                    f"create_memories_bulk entry {position} is missing "
+                    f"keys: {', '.join(missing_keys)}"
+                )
+        created: List[Dict[str, Any]] = []
+        # Paths confirmed to exist in this transaction; children of a parent
+        # created or checked earlier in the batch skip the parent lookup.
+        known_paths: set[Tuple[str, str]] = set()
+        async with self.session() as session:
+            for entry in entries:
+                created.append(
+                    await self._create_memory_in_session(
+                        session, known_paths=known_paths, **dict(entry)
                     )
-
-            # Determine the final path
-            if title:
-                # Use provided title as path segment
-                final_path = f"{parent_path}/{title}" if parent_path else title
-            else:
-                # Auto-assign numeric ID
-                next_num = await self._get_next_numeric_id(session, parent_path, domain)
-                final_path = (
-                    f"{parent_path}/{next_num}" if parent_path else str(next_num)
                 )
+        return created
 
-            # Check if path already exists in this domain
-            existing = await session.execute(
-                select(Path).where(Path.domain == domain).where(Path.path == final_path)
+    async def _create_memory_in_session(
+        self,
+        session: AsyncSession,
+        *,
+        parent_path: str,
+        content: str,
+        priority: int,
+        title: Optional[str] = None,
+        disclosure: Optional[str] = None,
+        domain: str = "core",
+        index_now: bool = True,
+        known_paths: Optional[set[Tuple[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """Create one memory + path inside an open session (no commit)."""
+        # Validate parent exists (if specified)
+        if parent_path and (
+            known_paths is None or (domain, parent_path) not in known_paths
+        ):
+            parent_exists = await session.execute(
+                select(Path)
+                .where(Path.domain == domain)
+                .where(Path.path == parent_path)
             )
-            if existing.scalar_one_or_none():
-                raise ValueError(f"Path '{domain}://{final_path}' already exists")
-
-            # Create memory (content only, no title stored)
-            memory = Memory(content=content)
-            session.add(memory)
-            await session.flush()  # Get the ID
+            if not parent_exists.scalar_one_or_none():
+                raise ValueError(
+                    f"Parent '{domain}://{parent_path}' does not exist. "
+                    f"Create the parent first, or use '{domain}://' as root."
+                )
+            if known_paths is not None:
+                known_paths.add((domain, parent_path))
 
-            # Create path (with metadata)
-            path_obj = Path(
-                domain=domain,
-                path=final_path,
-                memory_id=memory.id,
-                priority=priority,
-                disclosure=disclosure,
+        # Determine the final path
+        if title:
+            # Use provided title as path segment
+            final_path = f"{parent_path}/{title}" if parent_path else title
+        else:
+            # Auto-assign numeric ID
+            next_num = await self._get_next_numeric_id(session, parent_path, domain)
+            final_path = (
+                f"{parent_path}/{next_num}" if parent_path else str(next_num)
             )
-            session.add(path_obj)
-            indexed_chunks = 0
-            if index_now:
-                indexed_chunks = await self._reindex_memory(session, memory.id)
 
-            return {
-                "id": memory.id,
-                "domain": domain,
-                "path": final_path,
-                "uri": f"{domain}://{final_path}",
-                "priority": priority,
-                "indexed_chunks": indexed_chunks,
-                "index_pending": not index_now,
-                "index_targets": [memory.id],
-            }
+        # Check if path already exists in this domain
+        existing = await session.execute(
+            select(Path).where(Path.domain == domain).where(Path.path == final_path)
+        )
+        if existing.scalar_one_or_none():
+            raise ValueError(f"Path '{domain}://{final_path}' already exists")
+
+        # Create memory (content only, no title stored)
+        memory = Memory(content=content)
+        session.add(memory)
+        await session.flush()  # Get the ID
+
+        # Create path (with metadata)
+        path_obj = Path(
+            domain=domain,
+            path=final_path,
+            memory_id=memory.id,
+            priority=priority,
+            disclosure=disclosure,
+        )
+        session.add(path_obj)
+        if known_paths is not None:
+            known_paths.add((domain, final_path))
+        indexed_chunks = 0
+        if index_now:
+            indexed_chunks = await self._reindex_memory(session, memory.id)
+
+        return {
+            "id": memory.id,
+            "domain": domain,
+            "path": final_path,
+            "uri": f"{domain}://{final_path}",
+            "priority": priority,
+            "indexed_chunks": indexed_chunks,
+            "index_pending": not index_now,
+            "index_targets": [memory.id],
+        }
 
     async def _get_next_numeric_id(
         self, session: AsyncSession, parent_path: str, domain: str = "core"
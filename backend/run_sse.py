@@ -1,10 +1,12 @@
 import os
 import sys
 import hmac
+import json
 import asyncio
 import uvicorn
 from collections import deque
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from ipaddress import ip_address
 from typing import Deque, Dict, Optional
 from urllib.parse import quote
@@ -20,7 +22,6 @@ from starlette.applications import Starlette
 from starlette.datastructures import Headers
 from starlette.requests import Request
 from starlette.responses import Response
-from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 from starlette.types import ASGIApp, Receive, Scope, Send
 
@@ -32,11 +33,14 @@ from mcp.server.sse import SseServerTransport
 from mcp.shared.message import ServerMessageMetadata, SessionMessage
 
 _MCP_API_KEY_ENV = "MCP_API_KEY"
-_MCP_API_KEY_HEADER = "X-MCP-API-Key"
+_MCP_API_KEY_HEADER = b"x-mcp-api-key"
+_AUTHORIZATION_HEADER = b"authorization"
+_BEARER_PREFIX = b"bearer "
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
 _MCP_API_KEY_ALLOW_INSECURE_LOCAL_ENV = "MCP_API_KEY_ALLOW_INSECURE_LOCAL"
-_TRUTHY_ENV_VALUES = {"1", "true", "yes", "on", "enabled"}
-_LOOPBACK_CLIENT_HOSTS = {"127.0.0.1", "::1", "localhost"}
-_FORWARDED_HEADER_NAMES = {
+_TRUTHY_ENV_VALUES = frozenset({"1", "true", "yes", "on", "enabled"})
+_LOOPBACK_CLIENT_HOSTS = frozenset({"127.0.0.1", "::1", "localhost"})
+_FORWARDED_HEADER_NAMES = frozenset({
     "forwarded",
     "x-forwarded-for",
     "x-forwarded-host",
@@ -46,9 +50,40 @@ _FORWARDED_HEADER_NAMES = {
     "x-client-ip",
     "true-client-ip",
     "cf-connecting-ip",
+})
+_SSE_HTTP_PATHS = frozenset(
+    {"/sse", "/sse/", "/messages", "/messages/", "/sse/messages", "/sse/messages/"}
+)
+_PUBLIC_HTTP_PATHS = frozenset({"/health", "/health/"})
+
+
+_AUTH_FAILURE_REASONS = (
+    "api_key_not_configured",
+    "insecure_local_override_requires_loopback",
+    "invalid_or_missing_api_key",
+)
+
+
+def _build_auth_failure_response(reason: str) -> tuple[list[tuple[bytes, bytes]], bytes]:
+    body = json.dumps(
+        {"error": "mcp_sse_auth_failed", "reason": reason},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+        (b"www-authenticate", b"Bearer"),
+    ]
+    return headers, body
+
+
+_AUTH_FAILURE_RESPONSES = {
+    reason: _build_auth_failure_response(reason) for reason in _AUTH_FAILURE_REASONS
 }
-_SSE_HTTP_PATHS = {"/sse", "/sse/", "/messages", "/messages/", "/sse/messages", "/sse/messages/"}
-_PUBLIC_HTTP_PATHS = {"/health", "/health/"}
+_HEALTH_RESPONSE_BODY = json.dumps(
+    {"status": "ok", "service": "memory-palace-sse"},
+    separators=(",", ":"),
+).encode("utf-8")
 
 
 def _env_int(name: str, default: int, *, minimum: int = 1) -> int:
@@ -71,19 +106,33 @@ def _allow_insecure_local_without_api_key() -> bool:
     return value in _TRUTHY_ENV_VALUES
 
 
-def _extract_bearer_token(authorization: Optional[str]) -> Optional[str]:
-    if not authorization or not isinstance(authorization, str):
+def _extract_bearer_token(authorization: Optional[bytes]) -> Optional[bytes]:
+    if not authorization:
         return None
     value = authorization.strip()
-    if not value:
-        return None
-    scheme, _, token = value.partition(" ")
-    if scheme.lower() != "bearer":
+    if value[:_BEARER_PREFIX_LEN].lower() != _BEARER_PREFIX:
         return None
-    token = token.strip()
+    token = value[_BEARER_PREFIX_LEN:].strip()
     return token if token else None
 
 
+def _extract_provided_api_key(scope: Scope) -> Optional[bytes]:
+    api_key: Optional[bytes] = None
+    authorization: Optional[bytes] = None
+    for name, value in scope.get("headers") or ():
+        if name == _MCP_API_KEY_HEADER:
+            if api_key is None:
+                api_key = value
+        elif name == _AUTHORIZATION_HEADER:
+            if authorization is None:
+                authorization = value
+    if api_key is not None:
+        api_key = api_key.strip()
+        if api_key:
+            return api_key
+    return _extract_bearer_token(authorization)
+
+
 def _is_loopback_scope(scope: Scope) -> bool:
     client = scope.get("client")
     host = ""
@@ -102,6 +151,7 @@ def _is_loopback_scope(scope: Scope) -> bool:
     return True
 
 
+@lru_cache(maxsize=256)
 def _is_loopback_hostname(value: Optional[str]) -> bool:
     if not value:
         return False
@@ -390,56 +440,47 @@ class MemoryPalaceSseServerTransport(SseServerTransport):
         await response(scope, receive, send)
 
 
-def apply_mcp_api_key_middleware(app: ASGIApp) -> ASGIApp:
-    async def _auth_middleware(scope: Scope, receive: Receive, send: Send) -> None:
-        if scope.get("type") != "http":
-            await app(scope, receive, send)
+class MCPAPIKeyMiddleware:
+    """Pure ASGI guard that enforces the MCP API key before dispatching.
+
+    The key and the insecure-local override are read from the environment once,
+    when the middleware is built, so restart the server after changing them.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._configured_api_key = _get_configured_mcp_api_key().encode("utf-8")
+        self._allow_insecure_local = _allow_insecure_local_without_api_key()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
             return
 
         path = str(scope.get("path") or "")
         if path in _PUBLIC_HTTP_PATHS:
-            await app(scope, receive, send)
+            await self.app(scope, receive, send)
             return
 
-        configured = _get_configured_mcp_api_key()
-        headers = Headers(scope=scope)
+        configured = self._configured_api_key
         if not configured:
-            if _allow_insecure_local_without_api_key() and _is_direct_loopback_scope(scope):
-                await app(scope, receive, send)
+            if self._allow_insecure_local and _is_direct_loopback_scope(scope):
+                await self.app(scope, receive, send)
                 return
             reason = (
                 "insecure_local_override_requires_loopback"
-                if _allow_insecure_local_without_api_key()
+                if self._allow_insecure_local
                 else "api_key_not_configured"
             )
-            response = JSONResponse(
-                status_code=401,
-                content={
-                    "error": "mcp_sse_auth_failed",
-                    "reason": reason,
-                },
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-            await response(scope, receive, send)
+            await self._reject(send, reason)
             return
 
-        provided = (
-            str(headers.get(_MCP_API_KEY_HEADER, "")).strip()
-            or _extract_bearer_token(headers.get("Authorization"))
-        )
+        provided = _extract_provided_api_key(scope)
         if not provided or not hmac.compare_digest(provided, configured):
-            response = JSONResponse(
-                status_code=401,
-                content={
-                    "error": "mcp_sse_auth_failed",
-                    "reason": "invalid_or_missing_api_key",
-                },
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-            await response(scope, receive, send)
+            await self._reject(send, "invalid_or_missing_api_key")
             return
         try:
-            await app(scope, receive, send)
+            await self.app(scope, receive, send)
         except ClosedResourceError:
             if _should_suppress_closed_resource_error(scope):
                 return
@@ -453,7 +494,15 @@ def apply_mcp_api_key_middleware(app: ASGIApp) -> ASGIApp:
                 return
             raise
 
-    return _auth_middleware
+    @staticmethod
+    async def _reject(send: Send, reason: str) -> None:
+        headers, body = _AUTH_FAILURE_RESPONSES[reason]
+        await send({"type": "http.response.start", "status": 401, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def apply_mcp_api_key_middleware(app: ASGIApp) -> ASGIApp:
+    return MCPAPIKeyMiddleware(app)
 
 
 def create_sse_app() -> ASGIApp:
@@ -475,7 +524,7 @@ def create_sse_app() -> ASGIApp:
         return await handle_sse(request.scope, request.receive, request._send)  # type: ignore[reportPrivateUsage]
 
     async def health_endpoint(_request: Request) -> Response:
-        return JSONResponse({"status": "ok", "service": "memory-palace-sse"})
+        return Response(_HEALTH_RESPONSE_BODY, media_type="application/json")
 
     routes = [
         Route("/health", endpoint=health_endpoint, methods=["GET"]),
@@ -504,6 +553,7 @@ def main():
     print(f"Starting SSE Server on http://{host}:{port}")
     print(f"SSE Endpoint: http://{host}:{port}/sse")
     
+    # uvicorn's default loop="auto" picks uvloop when it is installed.
     uvicorn.run(app, host=host, port=port)
 
 if __name__ == "__main__":
@@ -19,9 +19,21 @@ import re
 import time
 import uuid
 from collections import Counter, deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
 
 
 def _env_int(name: str, default: int, minimum: int = 0) -> int:
@@ -1098,6 +1110,7 @@ class IndexTaskWorker:
     """Background worker that executes reindex/rebuild tasks serially."""
 
     _FINAL_STATES: Set[str] = {"succeeded", "failed", "dropped", "cancelled"}
+    _SLEEP_READ_CONCURRENCY = 4
 
     def __init__(self) -> None:
         self._enabled = _env_bool("RUNTIME_INDEX_WORKER_ENABLED", True)
@@ -1111,6 +1124,9 @@ class IndexTaskWorker:
 
         self._jobs: Dict[str, Dict[str, Any]] = {}
         self._job_events: Dict[str, asyncio.Event] = {}
+        self._status_events: Dict[str, Dict[str, asyncio.Event]] = {}
+        self._reached_statuses: Dict[str, Set[str]] = {}
+        self._status_waiters: Dict[tuple[str, str], int] = {}
         self._recent_job_ids: Deque[str] = deque()
         self._pending_memory_jobs: Dict[int, str] = {}
         self._rebuild_job_id: Optional[str] = None
@@ -1120,6 +1136,7 @@ class IndexTaskWorker:
         self._succeeded_total = 0
         self._failed_total = 0
         self._dropped_total = 0
+        self._deduped_total = 0
         self._cancelled_total = 0
         self._active_job_id: Optional[str] = None
         self._active_execution_task: Optional[asyncio.Task[Any]] = None
@@ -1144,6 +1161,9 @@ class IndexTaskWorker:
         self._active_job_id = None
         self._jobs.clear()
         self._job_events.clear()
+        self._status_events.clear()
+        self._reached_statuses.clear()
+        self._status_waiters.clear()
         self._recent_job_ids.clear()
         self._pending_memory_jobs.clear()
         self._rebuild_job_id = None
@@ -1154,6 +1174,14 @@ class IndexTaskWorker:
         if not self._enabled:
             return
         self._ensure_loop_state()
+        # Hot path: every request calls this with the same factory once the
+        # runner is up, so skip the guard when there is nothing to change.
+        if (
+            self._client_factory is client_factory
+            and self._runner is not None
+            and not self._runner.done()
+        ):
+            return
         assert self._guard is not None
         async with self._guard:
             self._client_factory = client_factory
@@ -1194,6 +1222,7 @@ class IndexTaskWorker:
         async with self._guard:
             existing_job_id = self._pending_memory_jobs.get(memory_id)
             if existing_job_id:
+                self._deduped_total += 1
                 return {
                     "queued": False,
                     "deduped": True,
@@ -1217,14 +1246,14 @@ class IndexTaskWorker:
                 "memory_id": memory_id,
                 "reason": task.reason,
                 "requested_at": requested_at,
-                "status": "queued",
             }
+            self._set_job_status_locked(job_id, "queued")
             self._pending_memory_jobs[memory_id] = job_id
 
             try:
                 self._queue.put_nowait(task)
             except asyncio.QueueFull:
-                self._jobs[job_id]["status"] = "dropped"
+                self._set_job_status_locked(job_id, "dropped")
                 self._jobs[job_id]["error"] = "queue_full"
                 self._jobs[job_id]["finished_at"] = _utc_iso_now()
                 self._dropped_total += 1
@@ -1255,6 +1284,7 @@ class IndexTaskWorker:
         requested_at = _utc_iso_now()
         async with self._guard:
             if self._rebuild_job_id:
+                self._deduped_total += 1
                 return {
                     "queued": False,
                     "deduped": True,
@@ -1276,14 +1306,14 @@ class IndexTaskWorker:
                 "task_type": task.task_type,
                 "reason": task.reason,
                 "requested_at": requested_at,
-                "status": "queued",
             }
+            self._set_job_status_locked(job_id, "queued")
             self._rebuild_job_id = job_id
 
             try:
                 self._queue.put_nowait(task)
             except asyncio.QueueFull:
-                self._jobs[job_id]["status"] = "dropped"
+                self._set_job_status_locked(job_id, "dropped")
                 self._jobs[job_id]["error"] = "queue_full"
                 self._jobs[job_id]["finished_at"] = _utc_iso_now()
                 self._dropped_total += 1
@@ -1313,6 +1343,7 @@ class IndexTaskWorker:
         requested_at = _utc_iso_now()
         async with self._guard:
             if self._sleep_job_id:
+                self._deduped_total += 1
                 return {
                     "queued": False,
                     "deduped": True,
@@ -1334,14 +1365,14 @@ class IndexTaskWorker:
                 "task_type": task.task_type,
                 "reason": task.reason,
                 "requested_at": requested_at,
-                "status": "queued",
             }
+            self._set_job_status_locked(job_id, "queued")
             self._sleep_job_id = job_id
 
             try:
                 self._queue.put_nowait(task)
             except asyncio.QueueFull:
-                self._jobs[job_id]["status"] = "dropped"
+                self._set_job_status_locked(job_id, "dropped")
                 self._jobs[job_id]["error"] = "queue_full"
                 self._jobs[job_id]["finished_at"] = _utc_iso_now()
                 self._dropped_total += 1
@@ -1380,6 +1411,93 @@ class IndexTaskWorker:
             current = dict(self._jobs.get(job_id, {}))
         return {"ok": True, "job": current}
 
+    async def wait_for_status(
+        self,
+        *,
+        job_id: str,
+        status: str,
+        timeout_seconds: float = 10.0,
+    ) -> Dict[str, Any]:
+        """Wait until ``job_id`` has reached ``status``.
+
+        Returns ``{"ok": True, "job": snapshot}``; failures follow
+        ``wait_for_statuses``.
+        """
+        result = await self.wait_for_statuses(
+            specs=[(job_id, status)], timeout_seconds=timeout_seconds
+        )
+        if "jobs" not in result:
+            return result
+        payload = {key: value for key, value in result.items() if key != "jobs"}
+        payload["job"] = result["jobs"][job_id]
+        return payload
+
+    async def wait_for_statuses(
+        self,
+        *,
+        specs: Sequence[tuple[str, str]],
+        timeout_seconds: float = 10.0,
+    ) -> Dict[str, Any]:
+        """Wait until every ``(job_id, status)`` pair has been reached.
+
+        Returns ``{"ok": True, "jobs": {job_id: snapshot}}`` with snapshots
+        taken after the last transition fired. Unknown job ids fail fast with
+        ``{"ok": False, "error": ...}`` like ``get_job``. When a job finishes
+        without reaching its status, or ``timeout_seconds`` elapses first,
+        ``ok`` is False and ``jobs`` holds the current snapshots.
+        """
+        self._ensure_loop_state()
+        assert self._guard is not None
+        async with self._guard:
+            for job_id, _status in specs:
+                if job_id not in self._jobs:
+                    return {"ok": False, "error": f"job '{job_id}' not found."}
+            events = [
+                self._acquire_status_event_locked(job_id, status)
+                for job_id, status in specs
+            ]
+        timed_out = False
+        try:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(event.wait() for event in events)),
+                    timeout=max(0.0, float(timeout_seconds)),
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+            missed = [
+                (job_id, status)
+                for job_id, status in specs
+                if status not in self._reached_statuses.get(job_id, ())
+            ]
+        finally:
+            # No await here: the release must also run when the wait is
+            # cancelled, and it cannot interleave with other guard holders.
+            for (job_id, status), event in zip(specs, events):
+                self._release_status_event(job_id, status, event)
+        async with self._guard:
+            snapshots = {
+                job_id: dict(self._jobs.get(job_id, {})) for job_id, _ in specs
+            }
+        if timed_out:
+            return {
+                "ok": False,
+                "error": "timed out waiting for job statuses.",
+                "jobs": snapshots,
+            }
+        if missed:
+            job_id, status = missed[0]
+            final_status = snapshots[job_id].get("status")
+            return {
+                "ok": False,
+                "error": (
+                    f"job '{job_id}' finished as '{final_status}' "
+                    f"without reaching '{status}'."
+                ),
+                "jobs": snapshots,
+            }
+        return {"ok": True, "jobs": snapshots}
+
     async def get_job(self, *, job_id: str) -> Dict[str, Any]:
         self._ensure_loop_state()
         assert self._guard is not None
@@ -1419,7 +1537,7 @@ class IndexTaskWorker:
                 }
 
             if status == "queued":
-                job["status"] = "cancelled"
+                self._set_job_status_locked(normalized_job_id, "cancelled")
                 job["cancel_reason"] = cancel_reason
                 job["cancelled_at"] = cancellation_ts
                 job["finished_at"] = cancellation_ts
@@ -1444,7 +1562,7 @@ class IndexTaskWorker:
 
             if status in {"running", "cancelling"}:
                 if status != "cancelling":
-                    job["status"] = "cancelling"
+                    self._set_job_status_locked(normalized_job_id, "cancelling")
                     job["cancel_requested"] = True
                     job["cancel_reason"] = cancel_reason
                     job["cancel_requested_at"] = cancellation_ts
@@ -1497,6 +1615,7 @@ class IndexTaskWorker:
                     "succeeded": self._succeeded_total,
                     "failed": self._failed_total,
                     "dropped": self._dropped_total,
+                    "deduped": self._deduped_total,
                     "cancelled": self._cancelled_total,
                 },
                 "last_error": self._last_error,
@@ -1620,6 +1739,35 @@ class IndexTaskWorker:
         except ValueError:
             return 0.0
 
+    @classmethod
+    async def _gather_client_reads(
+        cls, reader: Callable[[int], Any], memory_ids: List[int]
+    ) -> List[Any]:
+        """Run independent per-memory reads concurrently, keeping input order.
+
+        At most ``_SLEEP_READ_CONCURRENCY`` reads are in flight so a large
+        orphan backlog cannot drain the client's connection pool.
+        Failures come back in place as the raised exception so callers can
+        record them per memory id, matching the old sequential loop.
+        """
+        semaphore = asyncio.Semaphore(cls._SLEEP_READ_CONCURRENCY)
+
+        async def _read(memory_id: int) -> Any:
+            async with semaphore:
+                raw = reader(memory_id)
+                if inspect.isawaitable(raw):
+                    raw = await raw
+                return raw
+
+        results = await asyncio.gather(
+            *(_read(memory_id) for memory_id in memory_ids),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        return list(results)
+
     async def _run_sleep_consolidation(
         self,
         *,
@@ -1691,6 +1839,7 @@ class IndexTaskWorker:
         if orphan_items:
             if callable(get_memory_version):
                 groups_by_hash: Dict[str, List[Dict[str, Any]]] = {}
+                orphan_ids: List[int] = []
                 for item in orphan_items:
                     try:
                         memory_id = int(item.get("id") or 0)
@@ -1698,13 +1847,14 @@ class IndexTaskWorker:
                         continue
                     if memory_id <= 0:
                         continue
-                    try:
-                        version_raw = get_memory_version(memory_id)
-                        if inspect.isawaitable(version_raw):
-                            version_raw = await version_raw
-                    except Exception as exc:
+                    orphan_ids.append(memory_id)
+                version_results = await self._gather_client_reads(
+                    get_memory_version, orphan_ids
+                )
+                for memory_id, version_raw in zip(orphan_ids, version_results):
+                    if isinstance(version_raw, Exception):
                         dedup_summary["errors"].append(
-                            {"memory_id": memory_id, "error": str(exc)}
+                            {"memory_id": memory_id, "error": str(version_raw)}
                         )
                         continue
                     if not isinstance(version_raw, dict):
@@ -1884,19 +2034,30 @@ class IndexTaskWorker:
 
                         snippets: List[str] = []
                         source_parts: List[str] = []
-                        for memory_id in memory_ids[:6]:
+                        sample_ids: List[int] = []
+                        for raw_memory_id in memory_ids[:6]:
                             try:
-                                memory_raw = get_memory_by_id(int(memory_id))
-                                if inspect.isawaitable(memory_raw):
-                                    memory_raw = await memory_raw
-                            except Exception as exc:
+                                sample_ids.append(int(raw_memory_id))
+                            except (TypeError, ValueError) as exc:
                                 fragment_rollup["errors"].append(
                                     {
                                         "group": f"{group['domain']}://{group['parent_path']}",
-                                        "memory_id": int(memory_id),
+                                        "memory_id": raw_memory_id,
                                         "error": str(exc),
                                     }
                                 )
+                        memory_results = await self._gather_client_reads(
+                            get_memory_by_id, sample_ids
+                        )
+                        for memory_id, memory_raw in zip(sample_ids, memory_results):
+                            if isinstance(memory_raw, Exception):
+                                fragment_rollup["errors"].append(
+                                    {
+                                        "group": f"{group['domain']}://{group['parent_path']}",
+                                        "memory_id": memory_id,
+                                        "error": str(memory_raw),
+                                    }
+                                )
                                 continue
                             if not isinstance(memory_raw, dict):
                                 continue
@@ -1995,7 +2156,7 @@ class IndexTaskWorker:
             record = self._jobs.get(task.job_id)
             if record is None:
                 return
-            record["status"] = "running"
+            self._set_job_status_locked(task.job_id, "running")
             record["started_at"] = _utc_iso_now()
             self._active_job_id = task.job_id
 
@@ -2012,7 +2173,7 @@ class IndexTaskWorker:
             record = self._jobs.get(task.job_id)
             if record is None:
                 return
-            record["status"] = status
+            self._set_job_status_locked(task.job_id, status)
             record["finished_at"] = finished_at
             if result is not None:
                 record["result"] = result
@@ -2046,6 +2207,51 @@ class IndexTaskWorker:
                 event.set()
             self._append_recent_job_locked(task.job_id)
 
+    def _set_job_status_locked(self, job_id: str, status: str) -> None:
+        self._jobs[job_id]["status"] = status
+        # Reached statuses stay recorded until the job is pruned, so a waiter
+        # that arrives after a transition still sees it. Events only exist
+        # while someone waits on them.
+        self._reached_statuses.setdefault(job_id, set()).add(status)
+        events = self._status_events.get(job_id, {})
+        if status in self._FINAL_STATES:
+            # Nothing follows a final status; wake every waiter so the ones
+            # whose status was skipped can report it instead of hanging.
+            for event in events.values():
+                event.set()
+        elif status in events:
+            events[status].set()
+
+    def _acquire_status_event_locked(self, job_id: str, status: str) -> asyncio.Event:
+        """Return an event that is set once ``job_id`` has reached ``status``."""
+        events = self._status_events.setdefault(job_id, {})
+        if status not in events:
+            events[status] = asyncio.Event()
+        event = events[status]
+        if (
+            status in self._reached_statuses.get(job_id, ())
+            or self._jobs[job_id].get("status") in self._FINAL_STATES
+        ):
+            event.set()
+        key = (job_id, status)
+        self._status_waiters[key] = self._status_waiters.get(key, 0) + 1
+        return event
+
+    def _release_status_event(
+        self, job_id: str, status: str, event: asyncio.Event
+    ) -> None:
+        key = (job_id, status)
+        remaining = self._status_waiters.get(key, 0) - 1
+        if remaining > 0:
+            self._status_waiters[key] = remaining
+            return
+        self._status_waiters.pop(key, None)
+        events = self._status_events.get(job_id)
+        if events is not None and events.get(status) is event:
+            events.pop(status, None)
+            if not events:
+                self._status_events.pop(job_id, None)
+
     def _append_recent_job_locked(self, job_id: str) -> None:
         if job_id in self._recent_job_ids:
             self._recent_job_ids.remove(job_id)
@@ -2057,6 +2263,8 @@ class IndexTaskWorker:
                 if stale_status in self._FINAL_STATES:
                     self._jobs.pop(stale_id, None)
                     self._job_events.pop(stale_id, None)
+                    self._status_events.pop(stale_id, None)
+                    self._reached_statuses.pop(stale_id, None)
 
 
 class SleepTimeConsolidator:
@@ -2064,7 +2272,8 @@ class SleepTimeConsolidator:
 
     _QUEUE_FULL_RETRY_SECONDS = 30.0
 
-    def __init__(self) -> None:
+    def __init__(self, *, time_source: Callable[[], float] = time.time) -> None:
+        self._now = time_source
         self._enabled = _env_bool("RUNTIME_SLEEP_CONSOLIDATION_ENABLED", True)
         self._check_interval_seconds = _env_int(
             "RUNTIME_SLEEP_CONSOLIDATION_INTERVAL_SECONDS", 1800, minimum=60
@@ -2093,7 +2302,7 @@ class SleepTimeConsolidator:
         reason: str = "runtime",
     ) -> Dict[str, Any]:
         async with self._guard:
-            now_ts = time.time()
+            now_ts = self._now()
             if not self._enabled:
                 self._last_result = {
                     "scheduled": False,
@@ -2173,5 +2382,23 @@ class RuntimeState:
     async def shutdown(self) -> None:
         await self.index_worker.shutdown()
 
+    @contextmanager
+    def override(self, **components: Any) -> Iterator["RuntimeState"]:
+        """Temporarily swap runtime components (or ``ensure_started``) in place."""
+        unknown = [name for name in components if not hasattr(self, name)]
+        if unknown:
+            raise AttributeError(f"unknown runtime component(s): {', '.join(unknown)}")
+        missing = object()
+        previous = {name: self.__dict__.get(name, missing) for name in components}
+        self.__dict__.update(components)
+        try:
+            yield self
+        finally:
+            for name, value in previous.items():
+                if value is missing:
+                    self.__dict__.pop(name, None)
+                else:
+                    self.__dict__[name] = value
+
 
 runtime_state = RuntimeState()
@@ -0,0 +1,96 @@
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from db.sqlite_client import SQLiteClient
+
+
+def _sqlite_url(db_path: Path) -> str:
+    return f"sqlite+aiosqlite:///{db_path}"
+
+
+def _record_sqlite_connect_kwargs(
+    monkeypatch: pytest.MonkeyPatch, db_path: Path
+) -> List[Dict[str, Any]]:
+    # aiosqlite opens engine connections with sqlite3.connect on its worker
+    # thread; migrations and probes open their own, so filter on the db path.
+    seen: List[Dict[str, Any]] = []
+    original_connect = sqlite3.connect
+
+    def _connect(database: Any, *args: Any, **kwargs: Any) -> sqlite3.Connection:
+        if str(database) == str(db_path) and "cached_statements" in kwargs:
+            seen.append(dict(kwargs))
+        return original_connect(database, *args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", _connect)
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_sizes_follow_env(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("DB_QUERY_CACHE_SIZE", "77")
+    monkeypatch.setenv("DB_SQLITE_STATEMENT_CACHE_SIZE", "9")
+    db_path = tmp_path / "statement-cache.db"
+    connect_kwargs = _record_sqlite_connect_kwargs(monkeypatch, db_path)
+
+    client = SQLiteClient(_sqlite_url(db_path))
+    try:
+        await client.init_db()
+        created = await client.create_memory(
+            parent_path="",
+            content="statement cache probe",
+            priority=1,
+            title="probe",
+            domain="core",
+        )
+        memory = await client.get_memory_by_path("probe", "core")
+
+        assert client.engine.sync_engine._compiled_cache.capacity == 77
+        assert connect_kwargs
+        assert all(kwargs.get("cached_statements") == 9 for kwargs in connect_kwargs)
+        assert memory is not None
+        assert memory["id"] == created["id"]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_sizes_ignore_invalid_env(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("DB_QUERY_CACHE_SIZE", "not-a-number")
+    monkeypatch.setenv("DB_SQLITE_STATEMENT_CACHE_SIZE", "-5")
+    db_path = tmp_path / "statement-cache-invalid.db"
+    connect_kwargs = _record_sqlite_connect_kwargs(monkeypatch, db_path)
+
+    client = SQLiteClient(_sqlite_url(db_path))
+    try:
+        await client.init_db()
+
+        assert client.engine.sync_engine._compiled_cache.capacity == 1200
+        assert connect_kwargs
+        assert all(kwargs.get("cached_statements") == 256 for kwargs in connect_kwargs)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_zero_disables_sqlite_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("DB_SQLITE_STATEMENT_CACHE_SIZE", "0")
+    db_path = tmp_path / "statement-cache-off.db"
+    connect_kwargs = _record_sqlite_connect_kwargs(monkeypatch, db_path)
+
+    client = SQLiteClient(_sqlite_url(db_path))
+    try:
+        await client.init_db()
+
+        assert connect_kwargs
+        assert all(kwargs.get("cached_statements") == 0 for kwargs in connect_kwargs)
+    finally:
+        await client.close()
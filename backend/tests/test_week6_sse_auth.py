@@ -3,6 +3,7 @@ from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 from pathlib import Path
 import http.client
+import httpx
 import os
 import pytest
 import signal
@@ -17,22 +18,29 @@ from run_sse import apply_mcp_api_key_middleware, create_sse_app
 from starlette.requests import Request
 
 
-def _build_client(*, client=("testclient", 50000)) -> TestClient:
-    app = FastAPI()
+@pytest.fixture(scope="module")
+def ping_app() -> FastAPI:
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
 
     @app.get("/ping")
     async def ping():
         return {"ok": True}
 
+    return app
+
+
+def _build_client(app: FastAPI, *, client=("testclient", 50000)) -> httpx.AsyncClient:
     wrapped_app = apply_mcp_api_key_middleware(app)
-    return TestClient(wrapped_app, client=client)
+    transport = httpx.ASGITransport(app=wrapped_app, client=client)
+    return httpx.AsyncClient(transport=transport, base_url="http://testserver")
 
 
-def test_sse_auth_rejects_when_api_key_not_configured_by_default(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_rejects_when_api_key_not_configured_by_default(monkeypatch, ping_app) -> None:
     monkeypatch.delenv("MCP_API_KEY", raising=False)
     monkeypatch.delenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", raising=False)
-    with _build_client() as client:
-        response = client.get("/ping")
+    async with _build_client(ping_app) as client:
+        response = await client.get("/ping")
     assert response.status_code == 401
     payload = response.json()
     assert payload.get("error") == "mcp_sse_auth_failed"
@@ -40,45 +48,49 @@ def test_sse_auth_rejects_when_api_key_not_configured_by_default(monkeypatch) ->
 
 
 @pytest.mark.parametrize("override_value", ["true", "enabled"])
-def test_sse_auth_allows_when_explicit_insecure_local_override_is_enabled(
-    monkeypatch, override_value: str
+@pytest.mark.anyio
+async def test_sse_auth_allows_when_explicit_insecure_local_override_is_enabled(
+    monkeypatch, ping_app, override_value: str
 ) -> None:
     monkeypatch.delenv("MCP_API_KEY", raising=False)
     monkeypatch.setenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", override_value)
-    with _build_client(client=("127.0.0.1", 50000)) as client:
-        response = client.get("/ping", headers={"Host": "127.0.0.1"})
+    async with _build_client(ping_app, client=("127.0.0.1", 50000)) as client:
+        response = await client.get("/ping", headers={"Host": "127.0.0.1"})
     assert response.status_code == 200
     assert response.json().get("ok") is True
 
 
-def test_sse_auth_rejects_insecure_local_override_for_non_loopback_client(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_rejects_insecure_local_override_for_non_loopback_client(monkeypatch, ping_app) -> None:
     monkeypatch.delenv("MCP_API_KEY", raising=False)
     monkeypatch.setenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", "true")
-    with _build_client(client=("203.0.113.10", 50000)) as client:
-        response = client.get("/ping")
+    async with _build_client(ping_app, client=("203.0.113.10", 50000)) as client:
+        response = await client.get("/ping")
     assert response.status_code == 401
     payload = response.json()
     assert payload.get("error") == "mcp_sse_auth_failed"
     assert payload.get("reason") == "insecure_local_override_requires_loopback"
 
 
-def test_sse_auth_rejects_insecure_local_override_when_forwarded_headers_present(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_rejects_insecure_local_override_when_forwarded_headers_present(monkeypatch, ping_app) -> None:
     monkeypatch.delenv("MCP_API_KEY", raising=False)
     monkeypatch.setenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", "true")
     headers = {"X-Forwarded-For": "198.51.100.8"}
-    with _build_client(client=("127.0.0.1", 50000)) as client:
-        response = client.get("/ping", headers=headers)
+    async with _build_client(ping_app, client=("127.0.0.1", 50000)) as client:
+        response = await client.get("/ping", headers=headers)
     assert response.status_code == 401
     payload = response.json()
     assert payload.get("error") == "mcp_sse_auth_failed"
     assert payload.get("reason") == "insecure_local_override_requires_loopback"
 
 
-def test_sse_auth_rejects_insecure_local_override_when_host_is_not_loopback(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_rejects_insecure_local_override_when_host_is_not_loopback(monkeypatch, ping_app) -> None:
     monkeypatch.delenv("MCP_API_KEY", raising=False)
     monkeypatch.setenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", "true")
-    with _build_client(client=("127.0.0.1", 50000)) as client:
-        response = client.get(
+    async with _build_client(ping_app, client=("127.0.0.1", 50000)) as client:
+        response = await client.get(
             "/ping",
             headers={"Host": "memory-palace.example"},
         )
@@ -88,33 +100,96 @@ def test_sse_auth_rejects_insecure_local_override_when_host_is_not_loopback(monk
     assert payload.get("reason") == "insecure_local_override_requires_loopback"
 
 
-def test_sse_auth_rejects_when_api_key_missing(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_rejects_when_api_key_missing(monkeypatch, ping_app) -> None:
     monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
-    with _build_client() as client:
-        response = client.get("/ping")
+    async with _build_client(ping_app) as client:
+        response = await client.get("/ping")
     assert response.status_code == 401
+    assert response.headers.get("www-authenticate") == "Bearer"
     payload = response.json()
     assert payload.get("error") == "mcp_sse_auth_failed"
     assert payload.get("reason") == "invalid_or_missing_api_key"
 
 
-def test_sse_auth_accepts_x_mcp_api_key_header(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_accepts_x_mcp_api_key_header(monkeypatch, ping_app) -> None:
     monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
     headers = {"X-MCP-API-Key": "week6-sse-secret"}
-    with _build_client() as client:
-        response = client.get("/ping", headers=headers)
+    async with _build_client(ping_app) as client:
+        response = await client.get("/ping", headers=headers)
     assert response.status_code == 200
     assert response.json().get("ok") is True
 
 
-def test_sse_auth_accepts_bearer_token(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_sse_auth_accepts_bearer_token(monkeypatch, ping_app) -> None:
     monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
     headers = {"Authorization": "Bearer week6-sse-secret"}
-    with _build_client() as client:
-        response = client.get("/ping", headers=headers)
+    async with _build_client(ping_app) as client:
+        response = await client.get("/ping", headers=headers)
     assert response.status_code == 200
     assert response.json().get("ok") is True
 
+
+@pytest.mark.parametrize(
+    ("authorization", "expected_status"),
+    [
+        ("bearer week6-sse-secret", 200),
+        ("  BEARER   week6-sse-secret  ", 200),
+        ("Basic week6-sse-secret", 401),
+        ("Bearer", 401),
+        ("Bearerweek6-sse-secret", 401),
+    ],
+)
+@pytest.mark.anyio
+async def test_sse_auth_parses_bearer_scheme_case_insensitively(
+    monkeypatch, ping_app, authorization: str, expected_status: int
+) -> None:
+    monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
+    async with _build_client(ping_app) as client:
+        response = await client.get("/ping", headers={"Authorization": authorization})
+    assert response.status_code == expected_status
+
+
+@pytest.mark.anyio
+async def test_sse_auth_rejects_non_ascii_api_key_without_error(monkeypatch, ping_app) -> None:
+    monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
+    headers = {"X-MCP-API-Key": "week6-sse-secrét".encode("utf-8")}
+    async with _build_client(ping_app) as client:
+        response = await client.get("/ping", headers=headers)
+    assert response.status_code == 401
+    assert response.json().get("reason") == "invalid_or_missing_api_key"
+
+
+@pytest.mark.anyio
+async def test_sse_auth_reads_api_key_once_at_construction(monkeypatch, ping_app) -> None:
+    monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
+    async with _build_client(ping_app) as client:
+        monkeypatch.setenv("MCP_API_KEY", "rotated-secret")
+        response = await client.get("/ping", headers={"X-MCP-API-Key": "week6-sse-secret"})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("scope_type", ["lifespan", "websocket"])
+@pytest.mark.anyio
+async def test_sse_auth_passes_non_http_scopes_through(monkeypatch, scope_type: str) -> None:
+    monkeypatch.delenv("MCP_API_KEY", raising=False)
+    monkeypatch.delenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", raising=False)
+    seen = []
+
+    async def _inner_app(scope, receive, send) -> None:
+        seen.append(scope["type"])
+
+    async def _unexpected(*_args):
+        raise AssertionError("auth middleware must not touch non-http channels")
+
+    middleware = apply_mcp_api_key_middleware(_inner_app)
+    await middleware({"type": scope_type}, _unexpected, _unexpected)
+
+    assert seen == [scope_type]
+
+
 @pytest.mark.anyio
 async def test_read_request_body_with_limit_rejects_stream_without_content_length() -> None:
     messages = [
@@ -146,7 +221,7 @@ async def test_read_request_body_with_limit_rejects_stream_without_content_lengt
 def test_sse_auth_preserves_streaming_response(monkeypatch) -> None:
     monkeypatch.setenv("MCP_API_KEY", "week6-sse-secret")
 
-    app = FastAPI()
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
 
     @app.get("/stream")
     async def stream():
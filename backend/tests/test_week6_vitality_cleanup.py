@@ -1,26 +1,263 @@
+import asyncio
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict
 
+import aiosqlite
 import pytest
-from sqlalchemy import select
+import pytest_asyncio
+from sqlalchemy import event, insert, select, text, update
 
 from api import maintenance as maintenance_api
 from db import sqlite_client as sqlite_client_module
-from db.sqlite_client import Memory, SQLiteClient
+from db.sqlite_client import Memory, Path as PathModel, SQLiteClient
 from runtime_state import CleanupReviewCoordinator, VitalityDecayCoordinator
 
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+_MEMORY_DB_URL = "sqlite+aiosqlite:///:memory:"
+_NOW = datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def _sqlite_url(db_path: Path) -> str:
     return f"sqlite+aiosqlite:///{db_path}"
 
 
-@pytest.mark.asyncio
-async def test_search_advanced_reinforces_memory_access(tmp_path: Path) -> None:
-    db_path = tmp_path / "week6-reinforce.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
+async def _analyze_template_db(client: SQLiteClient) -> None:
+    # Seed sqlite_stat1 from a few representative rows so the cleanup-candidate
+    # plans (and their index_usage reports) do not depend on empty-table guesses.
+    async with client.session() as session:
+        inserted = await session.execute(
+            insert(Memory).returning(Memory.id, sort_by_parameter_order=True),
+            [
+                {
+                    "content": f"analyze seed {idx}",
+                    "vitality_score": 0.05 * (idx + 1),
+                    "last_accessed_at": _days_ago(15 * idx),
+                    "access_count": idx % 3,
+                }
+                for idx in range(8)
+            ],
+        )
+        memory_ids = inserted.scalars().all()
+        await session.execute(
+            insert(PathModel),
+            [
+                {
+                    "domain": "core" if idx % 2 else "notes",
+                    "path": f"scope/seed_{idx}",
+                    "memory_id": memory_id,
+                    "priority": 1,
+                }
+                for idx, memory_id in enumerate(memory_ids)
+            ],
+        )
+        await session.execute(text("ANALYZE"))
+        await session.execute(text("DELETE FROM paths"))
+        await session.execute(text("DELETE FROM memories"))
+
+
+async def _init_template_db(database_url: str) -> None:
+    client = SQLiteClient(database_url)
+    try:
+        await client.init_db()
+        await _analyze_template_db(client)
+    finally:
+        await client.close()
+
+
+@pytest.fixture(scope="session")
+def week6_template_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    db_path = tmp_path_factory.mktemp("week6-template") / "template.db"
+    asyncio.run(_init_template_db(_sqlite_url(db_path)))
+    return db_path
+
+
+def _apply_test_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+    finally:
+        cursor.close()
+
+
+async def _restore_template_db(client: SQLiteClient, template_db: Path) -> None:
+    # `:memory:` engines use a StaticPool, so this connection is the test database.
+    async with client.engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        async with aiosqlite.connect(template_db) as template:
+            await template.backup(raw_connection.driver_connection)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_client(week6_template_db: Path):
+    client = SQLiteClient(_MEMORY_DB_URL)
+    event.listen(client.engine.sync_engine, "connect", _apply_test_pragmas)
+    try:
+        await _restore_template_db(client, week6_template_db)
+        await client.init_db()
+        yield client
+    finally:
+        await client.close()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def client(shared_client: SQLiteClient, week6_template_db: Path) -> SQLiteClient:
+    # Copying the template back over the shared connection resets every table,
+    # including FTS shadows, index_meta and sqlite_sequence, between tests.
+    await _restore_template_db(shared_client, week6_template_db)
+    return shared_client
+
+
+async def _noop_ensure_started(_factory) -> None:
+    return None
+
+
+@pytest.fixture(autouse=True)
+def _skip_runtime_startup(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        maintenance_api.runtime_state, "ensure_started", _noop_ensure_started
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_observability_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Fresh deques per test instead of clearing the shared ones under their locks.
+    monkeypatch.setattr(
+        maintenance_api,
+        "_search_events",
+        deque(maxlen=maintenance_api._SEARCH_EVENT_LIMIT),
+    )
+    monkeypatch.setattr(
+        maintenance_api,
+        "_cleanup_query_events",
+        deque(maxlen=maintenance_api._CLEANUP_QUERY_EVENT_LIMIT),
+    )
+    monkeypatch.setattr(maintenance_api, "_search_events_loaded", True)
+
+
+@pytest.fixture
+def maintenance_env(monkeypatch: pytest.MonkeyPatch, client: SQLiteClient) -> None:
+    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
+    monkeypatch.setattr(
+        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
+    )
+    monkeypatch.setattr(
+        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+    )
+
+
+def _days_ago(days: float) -> datetime:
+    return _NOW - timedelta(days=days)
+
+
+async def _force_vitality_state(
+    client: SQLiteClient,
+    memory_id: int,
+    *,
+    vitality_score: float,
+    last_accessed_at: datetime,
+    access_count: int,
+) -> None:
+    async with client.session() as session:
+        result = await session.execute(
+            update(Memory)
+            .where(Memory.id == memory_id)
+            .values(
+                vitality_score=vitality_score,
+                last_accessed_at=last_accessed_at,
+                access_count=access_count,
+            )
+        )
+        assert result.rowcount == 1
+
+
+async def _seed_stale_memory(
+    client: SQLiteClient,
+    *,
+    content: str,
+    vitality_score: float = 0.07,
+    last_accessed_at: datetime | None = None,
+    access_count: int = 0,
+) -> int:
+    """Insert an orphaned, low-vitality memory in a single transaction."""
+    async with client.session() as session:
+        return await session.scalar(
+            insert(Memory)
+            .values(
+                content=content,
+                vitality_score=vitality_score,
+                last_accessed_at=(
+                    _days_ago(80) if last_accessed_at is None else last_accessed_at
+                ),
+                access_count=access_count,
+            )
+            .returning(Memory.id)
+        )
+
 
+async def _memory_exists(client: SQLiteClient, memory_id: int) -> bool:
+    async with client.session() as session:
+        result = await session.execute(
+            text("SELECT 1 FROM memories WHERE id = :id LIMIT 1"), {"id": memory_id}
+        )
+        return result.scalar() is not None
+
+
+class _Clock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class _StaticRuntimeComponent:
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self._payload = payload
+
+    async def status(self) -> Dict[str, Any]:
+        return dict(self._payload)
+
+    summary = status
+
+
+class _FakeRuntime:
+    """Stand-in for runtime_state with canned status payloads per component."""
+
+    def __init__(self, base: Any, **payloads: Dict[str, Any]) -> None:
+        self._base = base
+        self._components = {
+            name: _StaticRuntimeComponent(payload) for name, payload in payloads.items()
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        components = self.__dict__.get("_components", {})
+        if name in components:
+            return components[name]
+        return getattr(self.__dict__["_base"], name)
+
+
+_OBSERVABILITY_RUNTIME_PAYLOADS: Dict[str, Dict[str, Any]] = {
+    "index_worker": {"enabled": True, "running": False, "recent_jobs": [], "stats": {}},
+    "write_lanes": {
+        "global_concurrency": 1,
+        "global_active": 0,
+        "global_waiting": 0,
+        "session_waiting_count": 0,
+        "session_waiting_sessions": 0,
+        "max_session_waiting": 0,
+        "wait_warn_ms": 2000,
+    },
+    "vitality_decay": {"applied": True, "degraded": False},
+    "cleanup_reviews": {"pending_reviews": 0},
+}
+
+
+async def test_search_advanced_reinforces_memory_access(client: SQLiteClient) -> None:
     created = await client.create_memory(
         parent_path="",
         content="Alpha payload for vitality reinforcement",
@@ -36,22 +273,20 @@ async def test_search_advanced_reinforces_memory_access(tmp_path: Path) -> None:
     )
 
     async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        assert int(memory.access_count or 0) >= 1
-        assert memory.last_accessed_at is not None
-        assert float(memory.vitality_score or 0.0) > 1.0
+        result = await session.execute(
+            select(
+                Memory.access_count, Memory.last_accessed_at, Memory.vitality_score
+            ).where(Memory.id == created["id"])
+        )
+        access_count, last_accessed_at, vitality_score = result.one()
+    assert int(access_count or 0) >= 1
+    assert last_accessed_at is not None
+    assert float(vitality_score or 0.0) > 1.0
 
-    await client.close()
     assert payload["results"]
 
 
-@pytest.mark.asyncio
-async def test_apply_vitality_decay_is_daily_idempotent(tmp_path: Path) -> None:
-    db_path = tmp_path / "week6-decay.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
+async def test_apply_vitality_decay_is_daily_idempotent(client: SQLiteClient) -> None:
     created = await client.create_memory(
         parent_path="",
         content="Decay target",
@@ -59,82 +294,89 @@ async def test_apply_vitality_decay_is_daily_idempotent(tmp_path: Path) -> None:
         title="decay",
         domain="core",
     )
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 1.6
-        memory.access_count = 0
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
-        )
-        session.add(memory)
+    await _force_vitality_state(
+        client,
+        created["id"],
+        vitality_score=1.6,
+        last_accessed_at=_days_ago(30),
+        access_count=0,
+    )
 
     first = await client.apply_vitality_decay(force=False, reason="test")
     second = await client.apply_vitality_decay(force=False, reason="test")
     third = await client.apply_vitality_decay(force=True, reason="test.force")
 
     async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        assert float(memory.vitality_score or 0.0) < 1.6
+        score = await session.scalar(
+            select(Memory.vitality_score).where(Memory.id == created["id"])
+        )
+    assert float(score or 0.0) < 1.6
 
-    await client.close()
     assert first["applied"] is True
     assert second["applied"] is False
     assert second["reason"] == "already_applied_today"
+    assert second["last_decay_day"] == first["day"]
     assert third["applied"] is True
 
 
-@pytest.mark.asyncio
+async def test_apply_vitality_decay_day_survives_reopen_on_disk(tmp_path: Path) -> None:
+    database_url = _sqlite_url(tmp_path / "week6_decay_durability.db")
+    client = SQLiteClient(database_url)
+    try:
+        await client.init_db()
+        await client.create_memory(
+            parent_path="",
+            content="Durable decay target",
+            priority=1,
+            title="durable_decay",
+            domain="core",
+        )
+        first = await client.apply_vitality_decay(force=False, reason="test")
+    finally:
+        await client.close()
+
+    reopened = SQLiteClient(database_url)
+    try:
+        await reopened.init_db()
+        second = await reopened.apply_vitality_decay(force=False, reason="test")
+    finally:
+        await reopened.close()
+
+    assert first["applied"] is True
+    assert second["applied"] is False
+    assert second["reason"] == "already_applied_today"
+    assert second["last_decay_day"] == first["day"]
+
+
 async def test_get_vitality_cleanup_candidates_returns_orphan_candidate(
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-candidates.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    created = await client.create_memory(
-        parent_path="",
+    memory_id = await _seed_stale_memory(
+        client,
         content="Orphan candidate content",
-        priority=1,
-        title="candidate",
-        domain="core",
+        vitality_score=0.12,
+        last_accessed_at=_days_ago(45),
+        access_count=0,
     )
-    await client.remove_path(path="candidate", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.12
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
-        )
-        memory.access_count = 0
-        session.add(memory)
 
     payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
         inactive_days=14,
         limit=20,
     )
-    await client.close()
 
     items = payload["items"]
     assert len(items) == 1
     item = items[0]
-    assert item["memory_id"] == created["id"]
+    assert item["memory_id"] == memory_id
     assert item["can_delete"] is True
     assert "orphaned" in item["reason_codes"]
     assert len(item["state_hash"]) == 64
 
 
-@pytest.mark.asyncio
 async def test_get_vitality_cleanup_candidates_respects_domain_and_path_prefix(
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-candidates-domain-prefix.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     await client.create_memory(
         parent_path="",
         content="notes scope root",
@@ -179,16 +421,14 @@ async def test_get_vitality_cleanup_candidates_respects_domain_and_path_prefix(
         domain="core",
     )
 
-    async with client.session() as session:
-        for memory_id in (keep["id"], skip_prefix["id"], skip_domain["id"]):
-            memory = await session.get(Memory, memory_id)
-            assert memory is not None
-            memory.vitality_score = 0.1
-            memory.last_accessed_at = (
-                datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
-            )
-            memory.access_count = 0
-            session.add(memory)
+    for memory_id in (keep["id"], skip_prefix["id"], skip_domain["id"]):
+        await _force_vitality_state(
+            client,
+            memory_id,
+            vitality_score=0.1,
+            last_accessed_at=_days_ago(45),
+            access_count=0,
+        )
 
     payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
@@ -197,7 +437,6 @@ async def test_get_vitality_cleanup_candidates_respects_domain_and_path_prefix(
         domain="notes",
         path_prefix="scope/",
     )
-    await client.close()
 
     items = payload["items"]
     assert len(items) == 1
@@ -205,14 +444,9 @@ async def test_get_vitality_cleanup_candidates_respects_domain_and_path_prefix(
     assert items[0]["uri"] == "notes://scope/keep_me"
 
 
-@pytest.mark.asyncio
 async def test_get_vitality_cleanup_candidates_uses_sql_scope_for_path_loading(
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-candidates-sql-scope.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     await client.create_memory(
         parent_path="",
         content="scope root",
@@ -236,23 +470,28 @@ async def test_get_vitality_cleanup_candidates_uses_sql_scope_for_path_loading(
         domain="core",
     )
 
-    for idx in range(80):
-        await client.add_path(
-            new_path=f"other/alias_{idx}",
-            target_path="scope/candidate",
-            new_domain="core",
-            target_domain="core",
+    created_at = _NOW.strftime("%Y-%m-%d %H:%M:%S.%f")
+    alias_rows = [
+        ("core", f"other/alias_{idx}", candidate["id"], created_at, 0)
+        for idx in range(80)
+    ]
+    async with client.engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        await driver_connection.executemany(
+            "INSERT INTO paths (domain, path, memory_id, created_at, priority) "
+            "VALUES (?, ?, ?, ?, ?)",
+            alias_rows,
         )
+        await driver_connection.commit()
 
-    async with client.session() as session:
-        memory = await session.get(Memory, candidate["id"])
-        assert memory is not None
-        memory.vitality_score = 0.06
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=90)
-        )
-        memory.access_count = 0
-        session.add(memory)
+    await _force_vitality_state(
+        client,
+        candidate["id"],
+        vitality_score=0.06,
+        last_accessed_at=_days_ago(90),
+        access_count=0,
+    )
 
     payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
@@ -261,7 +500,6 @@ async def test_get_vitality_cleanup_candidates_uses_sql_scope_for_path_loading(
         domain="core",
         path_prefix="scope/",
     )
-    await client.close()
 
     items = payload["items"]
     assert len(items) == 1
@@ -273,68 +511,54 @@ async def test_get_vitality_cleanup_candidates_uses_sql_scope_for_path_loading(
     assert int(query_profile.get("path_rows_loaded") or 0) <= 3
 
 
-@pytest.mark.asyncio
 async def test_get_vitality_cleanup_candidates_limit_keeps_week6_sort_order(
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-candidates-limit-order.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    oldest = await client.create_memory(
-        parent_path="",
-        content="Oldest low vitality",
-        priority=1,
-        title="oldest",
-        domain="core",
-    )
-    newer = await client.create_memory(
-        parent_path="",
-        content="Newer low vitality",
-        priority=1,
-        title="newer",
-        domain="core",
-    )
-    higher_score = await client.create_memory(
-        parent_path="",
-        content="Higher vitality score",
-        priority=1,
-        title="higher_score",
-        domain="core",
-    )
-
     async with client.session() as session:
-        oldest_row = await session.get(Memory, oldest["id"])
-        newer_row = await session.get(Memory, newer["id"])
-        higher_score_row = await session.get(Memory, higher_score["id"])
-        assert oldest_row is not None
-        assert newer_row is not None
-        assert higher_score_row is not None
-
-        now_naive = datetime.now(timezone.utc).replace(tzinfo=None)
-        oldest_row.vitality_score = 0.05
-        oldest_row.last_accessed_at = now_naive - timedelta(days=120)
-        newer_row.vitality_score = 0.05
-        newer_row.last_accessed_at = now_naive - timedelta(days=30)
-        higher_score_row.vitality_score = 0.08
-        higher_score_row.last_accessed_at = now_naive - timedelta(days=90)
-
-        oldest_row.access_count = 0
-        newer_row.access_count = 0
-        higher_score_row.access_count = 0
-        session.add(oldest_row)
-        session.add(newer_row)
-        session.add(higher_score_row)
+        inserted = await session.execute(
+            insert(Memory).returning(Memory.id, sort_by_parameter_order=True),
+            [
+                {
+                    "content": "Oldest low vitality",
+                    "vitality_score": 0.05,
+                    "last_accessed_at": _days_ago(120),
+                    "access_count": 0,
+                },
+                {
+                    "content": "Newer low vitality",
+                    "vitality_score": 0.05,
+                    "last_accessed_at": _days_ago(30),
+                    "access_count": 0,
+                },
+                {
+                    "content": "Higher vitality score",
+                    "vitality_score": 0.08,
+                    "last_accessed_at": _days_ago(90),
+                    "access_count": 0,
+                },
+            ],
+        )
+        oldest_id, newer_id, higher_score_id = inserted.scalars().all()
+        await session.execute(
+            insert(PathModel),
+            [
+                {"domain": "core", "path": title, "memory_id": memory_id, "priority": 1}
+                for title, memory_id in (
+                    ("oldest", oldest_id),
+                    ("newer", newer_id),
+                    ("higher_score", higher_score_id),
+                )
+            ],
+        )
 
     payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
         inactive_days=14,
         limit=2,
     )
-    await client.close()
 
     items = payload["items"]
-    assert [item["memory_id"] for item in items] == [oldest["id"], newer["id"]]
+    assert [item["memory_id"] for item in items] == [oldest_id, newer_id]
     assert payload["summary"]["total_candidates"] == 2
     query_profile = payload["summary"].get("query_profile") or {}
     index_usage = query_profile.get("index_usage") or {}
@@ -343,65 +567,47 @@ async def test_get_vitality_cleanup_candidates_limit_keeps_week6_sort_order(
     assert "path_scope_index" in index_usage
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_state_hash_stays_stable_when_only_time_passes(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-state-hash-stable.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    created = await client.create_memory(
-        parent_path="",
+    memory_id = await _seed_stale_memory(
+        client,
         content="Stable hash candidate",
-        priority=1,
-        title="stable_hash",
-        domain="core",
+        vitality_score=0.12,
+        last_accessed_at=datetime(2026, 1, 1, 0, 0, 0),
+        access_count=2,
     )
-    await client.remove_path(path="stable_hash", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.12
-        memory.last_accessed_at = datetime(2026, 1, 1, 0, 0, 0)
-        memory.access_count = 2
-        session.add(memory)
 
     first_now = datetime(2026, 2, 1, 0, 0, 0)
     second_now = first_now + timedelta(minutes=30)
 
-    monkeypatch.setattr(sqlite_client_module, "_utc_now_naive", lambda: first_now)
+    clock = _Clock(first_now)
+    monkeypatch.setattr(sqlite_client_module, "_utc_now_naive", clock)
     first_payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
         inactive_days=14,
         limit=20,
     )
 
-    monkeypatch.setattr(sqlite_client_module, "_utc_now_naive", lambda: second_now)
+    clock.now = second_now
     second_payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
         inactive_days=14,
         limit=20,
     )
 
-    await client.close()
-
     first_item = first_payload["items"][0]
     second_item = second_payload["items"][0]
     assert second_item["inactive_days"] > first_item["inactive_days"]
     assert first_item["state_hash"] == second_item["state_hash"]
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_prepare_and_confirm_delete_flow(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-flow.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Cleanup confirm flow",
@@ -410,27 +616,14 @@ async def test_vitality_cleanup_prepare_and_confirm_delete_flow(
         domain="core",
     )
     await client.remove_path(path="cleanup_note", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.08
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=90)
-        )
-        memory.access_count = 0
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+    await _force_vitality_state(
+        client,
+        created["id"],
+        vitality_score=0.08,
+        last_accessed_at=_days_ago(90),
+        access_count=0,
     )
+
     write_lane_calls: list[Dict[str, Any]] = []
 
     async def _run_write_lane_stub(
@@ -478,13 +671,8 @@ async def test_vitality_cleanup_prepare_and_confirm_delete_flow(
     )
     confirm_result = await maintenance_api.confirm_vitality_cleanup(confirm_req)
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() is None
+    assert not await _memory_exists(client, created["id"])
 
-    await client.close()
     assert prepare_result["status"] == "pending_confirmation"
     assert confirm_result["ok"] is True
     assert confirm_result["deleted_count"] == 1
@@ -493,15 +681,10 @@ async def test_vitality_cleanup_prepare_and_confirm_delete_flow(
     assert str(write_lane_calls[0]["session_id"] or "").startswith("maintenance.cleanup:")
 
 
-@pytest.mark.asyncio
 async def test_delete_orphan_uses_write_lane(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-delete-orphan-write-lane.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Delete orphan write lane",
@@ -534,56 +717,24 @@ async def test_delete_orphan_uses_write_lane(
 
     result = await maintenance_api.delete_orphan(created["id"])
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() is None
+    assert not await _memory_exists(client, created["id"])
 
-    await client.close()
     assert result["deleted_memory_id"] == created["id"]
     assert len(write_lane_calls) == 1
     assert write_lane_calls[0]["operation"] == "maintenance.delete_orphan"
     assert write_lane_calls[0]["session_id"] == f"maintenance.orphan:{created['id']}"
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_prepare_and_confirm_keep_flow(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-keep-flow.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    created = await client.create_memory(
-        parent_path="",
+    memory_id = await _seed_stale_memory(
+        client,
         content="Cleanup keep flow",
-        priority=1,
-        title="keep_note",
-        domain="core",
-    )
-    await client.remove_path(path="keep_note", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.06
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=120)
-        )
-        memory.access_count = 1
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+        vitality_score=0.06,
+        last_accessed_at=_days_ago(120),
+        access_count=1,
     )
 
     query_payload = await client.get_vitality_cleanup_candidates(
@@ -613,28 +764,18 @@ async def test_vitality_cleanup_prepare_and_confirm_keep_flow(
     )
     confirm_result = await maintenance_api.confirm_vitality_cleanup(confirm_req)
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() == created["id"]
+    assert await _memory_exists(client, memory_id)
 
-    await client.close()
     assert prepare_result["status"] == "pending_confirmation"
     assert confirm_result["ok"] is True
     assert confirm_result["kept_count"] == 1
     assert confirm_result["deleted_count"] == 0
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_confirm_skips_active_path_memory(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-active-path.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Active path memory",
@@ -642,26 +783,12 @@ async def test_vitality_cleanup_confirm_skips_active_path_memory(
         title="active_path_note",
         domain="core",
     )
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.05
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=60)
-        )
-        memory.access_count = 0
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+    await _force_vitality_state(
+        client,
+        created["id"],
+        vitality_score=0.05,
+        last_accessed_at=_days_ago(60),
+        access_count=0,
     )
 
     query_payload = await client.get_vitality_cleanup_candidates(
@@ -692,27 +819,17 @@ async def test_vitality_cleanup_confirm_skips_active_path_memory(
     )
     confirm_result = await maintenance_api.confirm_vitality_cleanup(confirm_req)
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() == created["id"]
+    assert await _memory_exists(client, created["id"])
 
-    await client.close()
     assert confirm_result["deleted_count"] == 0
     assert confirm_result["skipped_count"] == 1
     assert confirm_result["skipped"][0]["reason"] == "active_paths"
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_confirm_detects_stale_state_after_prepare(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-stale-confirm.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Stale confirm target",
@@ -721,26 +838,12 @@ async def test_vitality_cleanup_confirm_detects_stale_state_after_prepare(
         domain="core",
     )
     await client.remove_path(path="stale_confirm_note", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.07
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=75)
-        )
-        memory.access_count = 0
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+    await _force_vitality_state(
+        client,
+        created["id"],
+        vitality_score=0.07,
+        last_accessed_at=_days_ago(75),
+        access_count=0,
     )
 
     query_payload = await client.get_vitality_cleanup_candidates(
@@ -766,10 +869,12 @@ async def test_vitality_cleanup_confirm_detects_stale_state_after_prepare(
 
     # Simulate candidate state mutation between prepare and confirm.
     async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.access_count = int(memory.access_count or 0) + 1
-        session.add(memory)
+        result = await session.execute(
+            update(Memory)
+            .where(Memory.id == created["id"])
+            .values(access_count=Memory.access_count + 1)
+        )
+        assert result.rowcount == 1
 
     confirm_result = await maintenance_api.confirm_vitality_cleanup(
         maintenance_api.VitalityCleanupConfirmRequest(
@@ -779,55 +884,23 @@ async def test_vitality_cleanup_confirm_detects_stale_state_after_prepare(
         )
     )
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() == created["id"]
+    assert await _memory_exists(client, created["id"])
 
-    await client.close()
     assert confirm_result["deleted_count"] == 0
     assert confirm_result["skipped_count"] == 1
     assert confirm_result["skipped"][0]["reason"] == "stale_state"
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_keep_skips_when_state_changes_after_prepare(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-keep-stale-confirm.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    created = await client.create_memory(
-        parent_path="",
+    memory_id = await _seed_stale_memory(
+        client,
         content="Stale keep target",
-        priority=1,
-        title="stale_keep_note",
-        domain="core",
-    )
-    await client.remove_path(path="stale_keep_note", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.09
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=80)
-        )
-        memory.access_count = 1
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+        vitality_score=0.09,
+        last_accessed_at=_days_ago(80),
+        access_count=1,
     )
 
     query_payload = await client.get_vitality_cleanup_candidates(
@@ -852,10 +925,12 @@ async def test_vitality_cleanup_keep_skips_when_state_changes_after_prepare(
     review = prepare_result["review"]
 
     async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.access_count = int(memory.access_count or 0) + 1
-        session.add(memory)
+        result = await session.execute(
+            update(Memory)
+            .where(Memory.id == memory_id)
+            .values(access_count=Memory.access_count + 1)
+        )
+        assert result.rowcount == 1
 
     confirm_result = await maintenance_api.confirm_vitality_cleanup(
         maintenance_api.VitalityCleanupConfirmRequest(
@@ -865,27 +940,17 @@ async def test_vitality_cleanup_keep_skips_when_state_changes_after_prepare(
         )
     )
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() == created["id"]
+    assert await _memory_exists(client, memory_id)
 
-    await client.close()
     assert confirm_result["kept_count"] == 0
     assert confirm_result["skipped_count"] == 1
     assert confirm_result["skipped"][0]["reason"] == "stale_state"
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_confirm_skips_memory_missing_after_prepare(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-missing-confirm.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Missing confirm target",
@@ -894,26 +959,12 @@ async def test_vitality_cleanup_confirm_skips_memory_missing_after_prepare(
         domain="core",
     )
     await client.remove_path(path="missing_confirm_note", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.05
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=100)
-        )
-        memory.access_count = 0
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+    await _force_vitality_state(
+        client,
+        created["id"],
+        vitality_score=0.05,
+        last_accessed_at=_days_ago(100),
+        access_count=0,
     )
 
     query_payload = await client.get_vitality_cleanup_candidates(
@@ -947,22 +998,17 @@ async def test_vitality_cleanup_confirm_skips_memory_missing_after_prepare(
         )
     )
 
-    await client.close()
     assert confirm_result["ok"] is True
     assert confirm_result["deleted_count"] == 0
     assert confirm_result["skipped_count"] == 1
     assert confirm_result["skipped"][0]["reason"] == "memory_missing"
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_confirm_collects_unexpected_delete_errors(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-delete-error.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Delete error target",
@@ -971,26 +1017,12 @@ async def test_vitality_cleanup_confirm_collects_unexpected_delete_errors(
         domain="core",
     )
     await client.remove_path(path="delete_error_note", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.04
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=120)
-        )
-        memory.access_count = 0
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+    await _force_vitality_state(
+        client,
+        created["id"],
+        vitality_score=0.04,
+        last_accessed_at=_days_ago(120),
+        access_count=0,
     )
 
     query_payload = await client.get_vitality_cleanup_candidates(
@@ -1027,13 +1059,8 @@ async def test_vitality_cleanup_confirm_collects_unexpected_delete_errors(
         )
     )
 
-    async with client.session() as session:
-        still_exists = await session.execute(
-            select(Memory.id).where(Memory.id == created["id"])
-        )
-        assert still_exists.scalar_one_or_none() == created["id"]
+    assert await _memory_exists(client, created["id"])
 
-    await client.close()
     assert confirm_result["ok"] is False
     assert confirm_result["status"] == "partially_failed"
     assert confirm_result["deleted_count"] == 0
@@ -1042,29 +1069,13 @@ async def test_vitality_cleanup_confirm_collects_unexpected_delete_errors(
     assert "delete_boom" in confirm_result["errors"][0]["error"]
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_prepare_rejects_stale_state_hash(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-stale.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    created = await client.create_memory(
-        parent_path="",
-        content="Stale state hash",
-        priority=1,
-        title="stale_note",
-        domain="core",
-    )
-    await client.remove_path(path="stale_note", domain="core")
-
-    async def _ensure_started(_factory) -> None:
-        return None
+    memory_id = await _seed_stale_memory(client, content="Stale state hash")
 
     monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
 
     with pytest.raises(maintenance_api.HTTPException) as exc_info:
         await maintenance_api.prepare_vitality_cleanup(
@@ -1072,18 +1083,16 @@ async def test_vitality_cleanup_prepare_rejects_stale_state_hash(
                 action="delete",
                 selections=[
                     maintenance_api.CleanupSelectionItem(
-                        memory_id=created["id"],
+                        memory_id=memory_id,
                         state_hash="0" * 64,
                     )
                 ],
             )
         )
 
-    await client.close()
     assert exc_info.value.status_code == 409
 
 
-@pytest.mark.asyncio
 async def test_observability_summary_includes_vitality_sections(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -1097,50 +1106,13 @@ async def test_observability_summary_includes_vitality_sections(
         async def get_vitality_stats(self) -> Dict[str, Any]:
             return {"degraded": False, "total_memories": 3, "low_vitality_count": 1}
 
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    async def _index_worker_status() -> Dict[str, Any]:
-        return {"enabled": True, "running": False, "recent_jobs": [], "stats": {}}
-
-    async def _write_lane_status() -> Dict[str, Any]:
-        return {
-            "global_concurrency": 1,
-            "global_active": 0,
-            "global_waiting": 0,
-            "session_waiting_count": 0,
-            "session_waiting_sessions": 0,
-            "max_session_waiting": 0,
-            "wait_warn_ms": 2000,
-        }
-
-    async def _decay_status() -> Dict[str, Any]:
-        return {"applied": True, "degraded": False}
-
-    async def _cleanup_summary() -> Dict[str, Any]:
-        return {"pending_reviews": 0}
-
     monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: _DummyClient())
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state.index_worker, "status", _index_worker_status
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state.write_lanes, "status", _write_lane_status
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state.vitality_decay, "status", _decay_status
-    )
     monkeypatch.setattr(
-        maintenance_api.runtime_state.cleanup_reviews, "summary", _cleanup_summary
+        maintenance_api,
+        "runtime_state",
+        _FakeRuntime(maintenance_api.runtime_state, **_OBSERVABILITY_RUNTIME_PAYLOADS),
     )
 
-    async with maintenance_api._search_events_guard:
-        maintenance_api._search_events.clear()
-    async with maintenance_api._cleanup_query_events_guard:
-        maintenance_api._cleanup_query_events.clear()
-    monkeypatch.setattr(maintenance_api, "_search_events_loaded", True)
-
     payload = await maintenance_api.get_observability_summary()
 
     assert payload["status"] == "ok"
@@ -1151,7 +1123,6 @@ async def test_observability_summary_includes_vitality_sections(
     assert payload["cleanup_query_stats"]["index_hit_ratio"] == 0.0
 
 
-@pytest.mark.asyncio
 async def test_observability_summary_marks_degraded_when_vitality_stats_getter_missing(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -1162,54 +1133,17 @@ async def test_observability_summary_marks_degraded_when_vitality_stats_getter_m
         async def get_gist_stats(self) -> Dict[str, Any]:
             return {"degraded": False, "total_rows": 0}
 
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    async def _index_worker_status() -> Dict[str, Any]:
-        return {"enabled": True, "running": False, "recent_jobs": [], "stats": {}}
-
-    async def _write_lane_status() -> Dict[str, Any]:
-        return {
-            "global_concurrency": 1,
-            "global_active": 0,
-            "global_waiting": 0,
-            "session_waiting_count": 0,
-            "session_waiting_sessions": 0,
-            "max_session_waiting": 0,
-            "wait_warn_ms": 2000,
-        }
-
-    async def _decay_status() -> Dict[str, Any]:
-        return {"applied": True, "degraded": False}
-
-    async def _cleanup_summary() -> Dict[str, Any]:
-        return {"pending_reviews": 0}
-
     monkeypatch.setattr(
         maintenance_api,
         "get_sqlite_client",
         lambda: _DummyClientWithoutVitalityStats(),
     )
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state.index_worker, "status", _index_worker_status
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state.write_lanes, "status", _write_lane_status
-    )
     monkeypatch.setattr(
-        maintenance_api.runtime_state.vitality_decay, "status", _decay_status
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state.cleanup_reviews, "summary", _cleanup_summary
+        maintenance_api,
+        "runtime_state",
+        _FakeRuntime(maintenance_api.runtime_state, **_OBSERVABILITY_RUNTIME_PAYLOADS),
     )
 
-    async with maintenance_api._search_events_guard:
-        maintenance_api._search_events.clear()
-    async with maintenance_api._cleanup_query_events_guard:
-        maintenance_api._cleanup_query_events.clear()
-    monkeypatch.setattr(maintenance_api, "_search_events_loaded", True)
-
     payload = await maintenance_api.get_observability_summary()
 
     assert payload["status"] == "degraded"
@@ -1218,46 +1152,17 @@ async def test_observability_summary_marks_degraded_when_vitality_stats_getter_m
     assert payload["vitality_decay"]["degraded"] is False
 
 
-@pytest.mark.asyncio
 async def test_vitality_cleanup_query_stats_are_exposed_in_observability_summary(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    client: SQLiteClient,
+    maintenance_env: None,
 ) -> None:
-    db_path = tmp_path / "week6-cleanup-observability.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
-    created = await client.create_memory(
-        parent_path="",
+    memory_id = await _seed_stale_memory(
+        client,
         content="Cleanup observability target",
-        priority=1,
-        title="cleanup_obs",
-        domain="core",
-    )
-    await client.remove_path(path="cleanup_obs", domain="core")
-    async with client.session() as session:
-        memory = await session.get(Memory, created["id"])
-        assert memory is not None
-        memory.vitality_score = 0.07
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=80)
-        )
-        memory.access_count = 0
-        session.add(memory)
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "cleanup_reviews", CleanupReviewCoordinator()
-    )
-    monkeypatch.setattr(
-        maintenance_api.runtime_state, "vitality_decay", VitalityDecayCoordinator()
+        vitality_score=0.07,
+        last_accessed_at=_days_ago(80),
+        access_count=0,
     )
-    async with maintenance_api._cleanup_query_events_guard:
-        maintenance_api._cleanup_query_events.clear()
 
     query_result = await maintenance_api.query_vitality_cleanup_candidates(
         maintenance_api.VitalityCleanupQueryRequest(
@@ -1267,27 +1172,22 @@ async def test_vitality_cleanup_query_stats_are_exposed_in_observability_summary
         )
     )
     assert query_result["ok"] is True
+    assert memory_id in {int(item["memory_id"]) for item in query_result["items"]}
     summary_profile = query_result["summary"].get("query_profile") or {}
     assert float(summary_profile.get("query_ms") or 0.0) >= 0.0
 
     summary_payload = await maintenance_api.get_observability_summary()
     cleanup_stats = summary_payload["cleanup_query_stats"]
 
-    await client.close()
     assert cleanup_stats["total_queries"] >= 1
     assert cleanup_stats["memory_index_hit_queries"] >= 0
     assert cleanup_stats["path_index_hit_queries"] >= 0
     assert cleanup_stats["slow_queries"] >= 0
 
 
-@pytest.mark.asyncio
 async def test_get_vitality_cleanup_candidates_ignores_invalid_memory_ids(
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-candidates-invalid-memory-ids.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     target = await client.create_memory(
         parent_path="",
         content="Target memory for memory_ids filter",
@@ -1303,15 +1203,13 @@ async def test_get_vitality_cleanup_candidates_ignores_invalid_memory_ids(
         domain="core",
     )
 
-    async with client.session() as session:
-        memory = await session.get(Memory, target["id"])
-        assert memory is not None
-        memory.vitality_score = 0.1
-        memory.last_accessed_at = (
-            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
-        )
-        memory.access_count = 0
-        session.add(memory)
+    await _force_vitality_state(
+        client,
+        target["id"],
+        vitality_score=0.1,
+        last_accessed_at=_days_ago(45),
+        access_count=0,
+    )
 
     payload = await client.get_vitality_cleanup_candidates(
         threshold=0.2,
@@ -1320,21 +1218,14 @@ async def test_get_vitality_cleanup_candidates_ignores_invalid_memory_ids(
         memory_ids=[target["id"], "bad-id", None, "", "3.14", -1, 0, f"{target['id']}"],
     )
 
-    await client.close()
-
     items = payload["items"]
     assert len(items) == 1
     assert items[0]["memory_id"] == target["id"]
 
 
-@pytest.mark.asyncio
 async def test_reinforce_memory_access_ignores_invalid_memory_ids(
-    tmp_path: Path,
+    client: SQLiteClient,
 ) -> None:
-    db_path = tmp_path / "week6-reinforce-invalid-memory-ids.db"
-    client = SQLiteClient(_sqlite_url(db_path))
-    await client.init_db()
-
     created = await client.create_memory(
         parent_path="",
         content="Reinforce target",
@@ -1350,9 +1241,16 @@ async def test_reinforce_memory_access_ignores_invalid_memory_ids(
         )
 
     async with client.session() as session:
-        row = await session.get(Memory, created["id"])
-        assert row is not None
-        assert int(row.access_count or 0) >= 1
+        access_count = await session.scalar(
+            select(Memory.access_count).where(Memory.id == created["id"])
+        )
+    assert int(access_count or 0) >= 1
 
-    await client.close()
     assert reinforced == 1
+
+
+async def test_normalize_positive_int_ids_keeps_int_coercion_semantics() -> None:
+    assert SQLiteClient._normalize_positive_int_ids(
+        [7, True, 3.9, " 5 ", "7", 7, "0x10", b"9", -2, None, [1]]
+    ) == [7, 1, 3, 5, 9]
+    assert SQLiteClient._normalize_positive_int_ids(None) == []
@@ -1,7 +1,8 @@
 from typing import Any, Dict
 
+import httpx
+import pytest
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
 
 from api import maintenance as maintenance_api
 
@@ -97,15 +98,28 @@ class _NotScheduledSleepCoordinator:
         return {"enabled": True, "scheduled": False, "reason": "sleep_disabled"}
 
 
-def _build_client(
+@pytest.fixture(scope="module")
+def maintenance_app() -> FastAPI:
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+    app.include_router(maintenance_api.router)
+    return app
+
+
+def _build_client(app: FastAPI) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    return httpx.AsyncClient(transport=transport, base_url="http://127.0.0.1")
+
+
+async def _ensure_started(_factory) -> None:
+    return None
+
+
+def _install_runtime(
     monkeypatch,
     *,
     index_worker: Any,
     sleep_consolidation: Any | None = None,
-) -> TestClient:
-    async def _ensure_started(_factory) -> None:
-        return None
-
+) -> None:
     monkeypatch.delenv("MCP_API_KEY", raising=False)
     monkeypatch.setenv("MCP_API_KEY_ALLOW_INSECURE_LOCAL", "true")
     monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
@@ -117,20 +131,16 @@ def _build_client(
             sleep_consolidation,
         )
 
-    app = FastAPI()
-    app.include_router(maintenance_api.router)
-    return TestClient(
-        app,
-        client=("127.0.0.1", 50000),
-        base_url="http://127.0.0.1",
-    )
-
 
-def test_index_job_retry_endpoint_retries_failed_job(monkeypatch) -> None:
+@pytest.mark.asyncio
+async def test_index_job_retry_endpoint_retries_failed_job(
+    monkeypatch, maintenance_app: FastAPI
+) -> None:
     worker = _RetrySuccessWorker()
 
-    with _build_client(monkeypatch, index_worker=worker) as client:
-        response = client.post(
+    _install_runtime(monkeypatch, index_worker=worker)
+    async with _build_client(maintenance_app) as client:
+        response = await client.post(
             "/maintenance/index/job/idx-failed-reindex/retry",
             json={"reason": "retry-via-testclient"},
         )
@@ -147,17 +157,24 @@ def test_index_job_retry_endpoint_retries_failed_job(monkeypatch) -> None:
     assert worker.reindex_enqueue_calls == [(42, "retry-via-testclient")]
 
 
-def test_index_job_retry_endpoint_returns_404_when_job_not_found(monkeypatch) -> None:
+@pytest.mark.asyncio
+async def test_index_job_retry_endpoint_returns_404_when_job_not_found(
+    monkeypatch, maintenance_app: FastAPI
+) -> None:
     worker = _BaseIndexWorker(jobs={})
 
-    with _build_client(monkeypatch, index_worker=worker) as client:
-        response = client.post("/maintenance/index/job/idx-missing/retry")
+    _install_runtime(monkeypatch, index_worker=worker)
+    async with _build_client(maintenance_app) as client:
+        response = await client.post("/maintenance/index/job/idx-missing/retry")
 
     assert response.status_code == 404
     assert response.json().get("detail")
 
 
-def test_index_job_retry_endpoint_returns_409_when_status_not_allowed(monkeypatch) -> None:
+@pytest.mark.asyncio
+async def test_index_job_retry_endpoint_returns_409_when_status_not_allowed(
+    monkeypatch, maintenance_app: FastAPI
+) -> None:
     worker = _BaseIndexWorker(
         jobs={
             "idx-running": {
@@ -169,8 +186,9 @@ def test_index_job_retry_endpoint_returns_409_when_status_not_allowed(monkeypatc
         }
     )
 
-    with _build_client(monkeypatch, index_worker=worker) as client:
-        response = client.post("/maintenance/index/job/idx-running/retry")
+    _install_runtime(monkeypatch, index_worker=worker)
+    async with _build_client(maintenance_app) as client:
+        response = await client.post("/maintenance/index/job/idx-running/retry")
 
     assert response.status_code == 409
     detail = response.json().get("detail") or {}
@@ -179,11 +197,15 @@ def test_index_job_retry_endpoint_returns_409_when_status_not_allowed(monkeypatc
     assert detail["task_type"] == "reindex_memory"
 
 
-def test_index_job_retry_endpoint_returns_503_when_queue_full(monkeypatch) -> None:
+@pytest.mark.asyncio
+async def test_index_job_retry_endpoint_returns_503_when_queue_full(
+    monkeypatch, maintenance_app: FastAPI
+) -> None:
     worker = _QueueFullRetryWorker()
 
-    with _build_client(monkeypatch, index_worker=worker) as client:
-        response = client.post(
+    _install_runtime(monkeypatch, index_worker=worker)
+    async with _build_client(maintenance_app) as client:
+        response = await client.post(
             "/maintenance/index/job/idx-failed-rebuild/retry",
             json={"reason": "retry-week7-queue-full"},
         )
@@ -196,7 +218,10 @@ def test_index_job_retry_endpoint_returns_503_when_queue_full(monkeypatch) -> No
     assert detail["job_id"] == "idx-drop-rebuild"
 
 
-def test_index_job_retry_endpoint_returns_409_when_sleep_not_scheduled(monkeypatch) -> None:
+@pytest.mark.asyncio
+async def test_index_job_retry_endpoint_returns_409_when_sleep_not_scheduled(
+    monkeypatch, maintenance_app: FastAPI
+) -> None:
     worker = _BaseIndexWorker(
         jobs={
             "idx-sleep-failed": {
@@ -208,12 +233,13 @@ def test_index_job_retry_endpoint_returns_409_when_sleep_not_scheduled(monkeypat
     )
     sleep_consolidation = _NotScheduledSleepCoordinator()
 
-    with _build_client(
+    _install_runtime(
         monkeypatch,
         index_worker=worker,
         sleep_consolidation=sleep_consolidation,
-    ) as client:
-        response = client.post("/maintenance/index/job/idx-sleep-failed/retry")
+    )
+    async with _build_client(maintenance_app) as client:
+        response = await client.post("/maintenance/index/job/idx-sleep-failed/retry")
 
     assert response.status_code == 409
     detail = response.json().get("detail") or {}
@@ -1,28 +1,47 @@
 import asyncio
+import copy
+import functools
 import json
-import time
-from typing import Any, Dict
+import os
+from contextlib import ExitStack
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 import pytest
+import pytest_asyncio
 
 from api import maintenance as maintenance_api
+from api.maintenance import (
+    HTTPException,
+    IndexJobCancelRequest,
+    IndexJobRetryRequest,
+    cancel_index_job,
+    get_index_job,
+    retry_index_job,
+    runtime_state,
+    trigger_sleep_consolidation,
+)
 import mcp_server
-from runtime_state import IndexTaskWorker, SleepTimeConsolidator
+from runtime_state import IndexTaskWorker, RuntimeState, SleepTimeConsolidator
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+def _as_memory_id(value: Any) -> int:
+    # The worker already passes ints; only coerce anything else.
+    return value if type(value) is int else int(value)
 
 
 class _FakeIndexClient:
-    def __init__(self) -> None:
-        self.reindex_calls: list[tuple[int, str]] = []
-        self.rebuild_calls: list[str] = []
-        self.deleted_memory_ids: list[int] = []
-        self.gist_upserts: list[Dict[str, Any]] = []
-        self._slow_memory_ids: set[int] = {1, 99}
-        self._orphan_items: list[Dict[str, Any]] = [
-            {"id": 1, "category": "deprecated"},
-            {"id": 2, "category": "orphaned"},
-            {"id": 3, "category": "deprecated"},
-        ]
-        self._memory_versions: Dict[int, Dict[str, Any]] = {
+    # Canonical fixture data, shared by every instance. Only the outer
+    # memory-versions mapping is ever mutated, so reset() copies just that.
+    _ORPHAN_ITEMS: tuple[Dict[str, Any], ...] = (
+        {"id": 1, "category": "deprecated"},
+        {"id": 2, "category": "orphaned"},
+        {"id": 3, "category": "deprecated"},
+    )
+    _MEMORY_VERSIONS: Mapping[int, Dict[str, Any]] = MappingProxyType(
+        {
             1: {"memory_id": 1, "content": "Legacy duplicate payload", "deprecated": True},
             2: {"memory_id": 2, "content": "Independent orphan payload", "deprecated": False},
             3: {"memory_id": 3, "content": "Legacy duplicate payload", "deprecated": True},
@@ -31,20 +50,45 @@ class _FakeIndexClient:
             203: {"memory_id": 203, "content": "Alpha cluster fact three"},
             301: {"memory_id": 301, "content": "Beta standalone memory"},
         }
+    )
+    _RECENT_MEMORIES: tuple[Dict[str, Any], ...] = (
+        {"memory_id": 201, "uri": "core://projects/alpha/one"},
+        {"memory_id": 202, "uri": "core://projects/alpha/two"},
+        {"memory_id": 203, "uri": "core://projects/alpha/three"},
+        {"memory_id": 301, "uri": "core://projects/beta/one"},
+    )
+
+    def __init__(self) -> None:
+        self._slow_memory_ids: set[int] = {1, 99}
+        self._slow_release: asyncio.Event | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        # Unblock anything a failed test left parked on the previous gate.
+        self.release_slow()
+        self._slow_release = asyncio.Event()
+        self.reindex_calls: list[tuple[int, str]] = []
+        self.rebuild_calls: list[str] = []
+        self.deleted_memory_ids: list[int] = []
+        self.gist_upserts: list[Dict[str, Any]] = []
+        self._memory_versions: Dict[int, Dict[str, Any]] = dict(self._MEMORY_VERSIONS)
 
     async def reindex_memory(self, *, memory_id: int, reason: str = "write") -> Dict[str, Any]:
         self.reindex_calls.append((memory_id, reason))
         if memory_id in self._slow_memory_ids:
-            await asyncio.sleep(0.25)
+            await self._slow_release.wait()
         return {"ok": True, "memory_id": memory_id, "reason": reason}
 
+    def release_slow(self) -> None:
+        if self._slow_release is not None:
+            self._slow_release.set()
+
     async def rebuild_index(self, *, reason: str = "manual") -> Dict[str, Any]:
         self.rebuild_calls.append(reason)
-        await asyncio.sleep(0.05)
         return {"ok": True, "reason": reason}
 
     async def get_all_orphan_memories(self) -> list[Dict[str, Any]]:
-        return list(self._orphan_items)
+        return list(self._ORPHAN_ITEMS)
 
     async def get_vitality_cleanup_candidates(self, **_kwargs: Any) -> Dict[str, Any]:
         return {
@@ -56,10 +100,11 @@ class _FakeIndexClient:
         }
 
     async def get_memory_version(self, memory_id: int) -> Dict[str, Any]:
-        payload = self._memory_versions.get(int(memory_id))
+        payload = self._memory_versions.get(_as_memory_id(memory_id))
         if payload is None:
             raise ValueError(f"memory_id={memory_id} not found")
-        return dict(payload)
+        # Shared with the class template; reset_fake_client checks it stays intact.
+        return payload
 
     async def permanently_delete_memory(
         self,
@@ -70,7 +115,7 @@ class _FakeIndexClient:
     ) -> Dict[str, Any]:
         _ = require_orphan
         _ = expected_state_hash
-        parsed_id = int(memory_id)
+        parsed_id = _as_memory_id(memory_id)
         if parsed_id not in self._memory_versions:
             raise ValueError(f"memory_id={parsed_id} not found")
         self.deleted_memory_ids.append(parsed_id)
@@ -78,19 +123,14 @@ class _FakeIndexClient:
         return {"deleted": True, "memory_id": parsed_id}
 
     async def get_recent_memories(self, limit: int = 10) -> list[Dict[str, Any]]:
-        items = [
-            {"memory_id": 201, "uri": "core://projects/alpha/one"},
-            {"memory_id": 202, "uri": "core://projects/alpha/two"},
-            {"memory_id": 203, "uri": "core://projects/alpha/three"},
-            {"memory_id": 301, "uri": "core://projects/beta/one"},
-        ]
-        return items[: max(1, int(limit))]
+        return list(self._RECENT_MEMORIES[: max(1, int(limit))])
 
     async def get_memory_by_id(self, memory_id: int) -> Dict[str, Any]:
-        payload = self._memory_versions.get(int(memory_id))
+        parsed_id = _as_memory_id(memory_id)
+        payload = self._memory_versions.get(parsed_id)
         if payload is None:
             raise ValueError(f"memory_id={memory_id} not found")
-        return {"id": int(memory_id), "content": str(payload.get("content") or "")}
+        return {"id": parsed_id, "content": str(payload.get("content") or "")}
 
     async def upsert_memory_gist(self, **kwargs: Any) -> Dict[str, Any]:
         self.gist_upserts.append(dict(kwargs))
@@ -106,6 +146,11 @@ class _FakeIndexClient:
         return None
 
 
+_PRISTINE_FAKE_CLIENT_DATA = copy.deepcopy(
+    (_FakeIndexClient._ORPHAN_ITEMS, dict(_FakeIndexClient._MEMORY_VERSIONS))
+)
+
+
 class _SleepPreviewOnlyClient:
     def __init__(self) -> None:
         self.rebuild_calls: list[str] = []
@@ -127,25 +172,54 @@ class _FailingSleepRebuildClient(_FakeIndexClient):
         raise RuntimeError("sleep_rebuild_failed")
 
 
+def _frozen_job_response(job: Dict[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType({"ok": True, "job": MappingProxyType(dict(job))})
+
+
+class _ConcurrentReadProbeClient(_FakeIndexClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_memory_version(self, memory_id: int) -> Dict[str, Any]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if memory_id == 2:
+                raise ValueError("memory_id=2 unreadable")
+            return await super().get_memory_version(memory_id)
+        finally:
+            self.in_flight -= 1
+
+
 class _QueueFullIndexWorker:
     def __init__(self) -> None:
-        self._jobs: Dict[str, Dict[str, Any]] = {
-            "idx-failed-rebuild": {
-                "job_id": "idx-failed-rebuild",
-                "task_type": "rebuild_index",
-                "status": "failed",
-                "reason": "queue_full_prev",
-            }
+        self.reset()
+
+    def reset(self) -> None:
+        # Callers only read these payloads, so one read-only response per job
+        # is shared instead of copying the job on every get_job call.
+        self._responses: Dict[str, Mapping[str, Any]] = {
+            "idx-failed-rebuild": _frozen_job_response(
+                {
+                    "job_id": "idx-failed-rebuild",
+                    "task_type": "rebuild_index",
+                    "status": "failed",
+                    "reason": "queue_full_prev",
+                }
+            )
         }
 
     async def status(self) -> Dict[str, Any]:
         return {"enabled": True, "queue_depth": 0}
 
-    async def get_job(self, *, job_id: str) -> Dict[str, Any]:
-        job = self._jobs.get(job_id)
-        if job is None:
+    async def get_job(self, *, job_id: str) -> Mapping[str, Any]:
+        response = self._responses.get(job_id)
+        if response is None:
             return {"ok": False, "error": f"job '{job_id}' not found."}
-        return {"ok": True, "job": dict(job)}
+        return response
 
     async def enqueue_reindex_memory(self, *, memory_id: int, reason: str = "api") -> Dict[str, Any]:
         return {
@@ -186,65 +260,161 @@ class _QueueFullSleepCoordinator:
         }
 
 
-async def _wait_for_job_status(
+class _NotScheduledSleepCoordinator:
+    async def schedule(self, *, index_worker, force: bool = False, reason: str = "runtime") -> Dict[str, Any]:
+        _ = index_worker
+        _ = force
+        _ = reason
+        return {"scheduled": False, "reason": "sleep_disabled"}
+
+    async def status(self) -> Dict[str, Any]:
+        return {"enabled": False, "scheduled": False, "reason": "sleep_disabled"}
+
+
+# The fakes are cheap but shared by most tests; the stateful ones are reset
+# per test by the autouse fixtures below.
+_FAKE_INDEX_CLIENT = _FakeIndexClient()
+_QUEUE_FULL_INDEX_WORKER = _QueueFullIndexWorker()
+_QUEUE_FULL_SLEEP_COORDINATOR = _QueueFullSleepCoordinator()
+_NOT_SCHEDULED_SLEEP_COORDINATOR = _NotScheduledSleepCoordinator()
+
+
+async def _noop_ensure_started(_factory) -> None:
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _bind_ensure_started(worker: IndexTaskWorker, client: Any):
+    def _client_factory() -> Any:
+        return client
+
+    async def _ensure_started(_factory) -> None:
+        await worker.ensure_started(_client_factory)
+
+    return _ensure_started
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def worker_client():
+    worker = IndexTaskWorker()
+    client = _FAKE_INDEX_CLIENT
+    await worker.ensure_started(lambda: client)
+    try:
+        yield worker, client
+    finally:
+        await worker.shutdown()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def use_worker_client(worker_client):
+    worker, fake_client = worker_client
+
+    async def _use(client: Any) -> IndexTaskWorker:
+        await worker.ensure_started(lambda: client)
+        return worker
+
+    yield _use
+    await worker.ensure_started(lambda: fake_client)
+
+
+@pytest.fixture
+def reset_fake_client(worker_client):
+    _worker, client = worker_client
+    client.reset()
+    yield worker_client
+    # The fake hands out its template payloads without copying them, so make
+    # sure nothing under test wrote through one.
+    assert (
+        client._ORPHAN_ITEMS,
+        dict(client._MEMORY_VERSIONS),
+    ) == _PRISTINE_FAKE_CLIENT_DATA
+
+
+@pytest.fixture(autouse=True)
+def reset_queue_full_worker():
+    _QUEUE_FULL_INDEX_WORKER.reset()
+
+
+def _fake_index_client_factory() -> _FakeIndexClient:
+    return _FAKE_INDEX_CLIENT
+
+
+@pytest.fixture(autouse=True)
+def runtime_override(reset_fake_client, monkeypatch: pytest.MonkeyPatch):
+    worker, client = reset_fake_client
+    # Both entry points resolve their client through get_sqlite_client; every
+    # test here runs against the shared fake unless it binds its own worker.
+    monkeypatch.setattr(maintenance_api, "get_sqlite_client", _fake_index_client_factory)
+    monkeypatch.setattr(mcp_server, "get_sqlite_client", _fake_index_client_factory)
+    with ExitStack() as stack:
+        stack.enter_context(
+            runtime_state.override(
+                ensure_started=_bind_ensure_started(worker, client),
+                index_worker=worker,
+            )
+        )
+        yield lambda **components: stack.enter_context(runtime_state.override(**components))
+
+
+@pytest.fixture
+def queue_full_runtime(runtime_override):
+    runtime_override(
+        ensure_started=_noop_ensure_started,
+        index_worker=_QUEUE_FULL_INDEX_WORKER,
+    )
+    return runtime_override
+
+
+async def _mcp_rebuild_index(**kwargs: Any) -> Dict[str, Any]:
+    # MCP tools answer with a JSON string; decode it once for assertions.
+    return json.loads(await mcp_server.rebuild_index(**kwargs))
+
+
+async def _wait_for_job_statuses(
     worker: IndexTaskWorker,
-    *,
-    job_id: str,
-    expected_status: str,
+    *specs: tuple[str, str],
     timeout_seconds: float = 2.0,
-) -> Dict[str, Any]:
-    deadline = time.monotonic() + timeout_seconds
-    while time.monotonic() < deadline:
-        payload = await worker.get_job(job_id=job_id)
-        if payload.get("ok") and (payload.get("job") or {}).get("status") == expected_status:
-            return payload["job"]
-        await asyncio.sleep(0.01)
-    raise AssertionError(f"job {job_id} did not reach status '{expected_status}' in time")
+) -> Dict[str, Dict[str, Any]]:
+    result = await worker.wait_for_statuses(specs=specs, timeout_seconds=timeout_seconds)
+    if not result["ok"]:
+        pending = ", ".join(f"{job_id}->'{status}'" for job_id, status in specs)
+        raise AssertionError(f"jobs did not reach {pending}: {result['error']}")
+    return result["jobs"]
 
 
-@pytest.mark.asyncio
 async def test_index_job_detail_returns_404_when_job_not_found(
-    monkeypatch: pytest.MonkeyPatch,
+    runtime_override,
 ) -> None:
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
+    runtime_override(ensure_started=_noop_ensure_started)
 
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.get_index_job("idx-missing")
+    with pytest.raises(HTTPException) as exc_info:
+        await get_index_job("idx-missing")
 
     assert exc_info.value.status_code == 404
     assert "not found" in str(exc_info.value.detail)
 
 
-@pytest.mark.asyncio
 async def test_index_job_cancel_cancels_queued_job_and_job_detail_reflects_cancelled(
-    monkeypatch: pytest.MonkeyPatch,
+    worker_client,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
-
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
+    worker, client = worker_client
 
     first = await worker.enqueue_reindex_memory(memory_id=1, reason="week7-first")
     second = await worker.enqueue_reindex_memory(memory_id=2, reason="week7-second")
-    await _wait_for_job_status(worker, job_id=first["job_id"], expected_status="running")
-    await _wait_for_job_status(worker, job_id=second["job_id"], expected_status="queued")
+    await _wait_for_job_statuses(
+        worker,
+        (first["job_id"], "running"),
+        (second["job_id"], "queued"),
+    )
 
-    cancel_result = await maintenance_api.cancel_index_job(
+    cancel_result = await cancel_index_job(
         second["job_id"],
-        maintenance_api.IndexJobCancelRequest(reason="unit_cancel"),
+        IndexJobCancelRequest(reason="unit_cancel"),
     )
-    detail_result = await maintenance_api.get_index_job(second["job_id"])
+    detail_result = await get_index_job(second["job_id"])
 
+    client.release_slow()
     await worker.wait_for_job(job_id=first["job_id"], timeout_seconds=2.0)
-    await worker.shutdown()
 
     assert cancel_result["ok"] is True
     assert cancel_result.get("cancelled") is True
@@ -256,34 +426,23 @@ async def test_index_job_cancel_cancels_queued_job_and_job_detail_reflects_cance
     assert detail_result["runtime_worker"]["stats"]["cancelled"] >= 1
 
 
-@pytest.mark.asyncio
 async def test_index_job_cancel_requests_running_job_and_finishes_as_cancelled(
-    monkeypatch: pytest.MonkeyPatch,
+    worker_client,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
-
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
+    worker, _client = worker_client
 
     enqueue_result = await worker.enqueue_reindex_memory(memory_id=99, reason="week7-running")
-    await _wait_for_job_status(worker, job_id=enqueue_result["job_id"], expected_status="running")
+    await _wait_for_job_statuses(worker, (enqueue_result["job_id"], "running"))
 
-    cancel_result = await maintenance_api.cancel_index_job(
+    cancel_result = await cancel_index_job(
         enqueue_result["job_id"],
-        maintenance_api.IndexJobCancelRequest(reason="manual_abort"),
+        IndexJobCancelRequest(reason="manual_abort"),
     )
     wait_result = await worker.wait_for_job(
         job_id=enqueue_result["job_id"],
         timeout_seconds=2.0,
     )
-    detail_result = await maintenance_api.get_index_job(enqueue_result["job_id"])
-
-    await worker.shutdown()
+    detail_result = await get_index_job(enqueue_result["job_id"])
 
     assert cancel_result["ok"] is True
     assert cancel_result.get("cancel_requested") is True
@@ -294,31 +453,19 @@ async def test_index_job_cancel_requests_running_job_and_finishes_as_cancelled(
     assert detail_result["job"]["status"] == "cancelled"
 
 
-@pytest.mark.asyncio
-async def test_index_job_cancel_returns_404_when_job_not_found(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    worker = IndexTaskWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.cancel_index_job(
+async def test_index_job_cancel_returns_404_when_job_not_found() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        await cancel_index_job(
             "idx-missing",
-            maintenance_api.IndexJobCancelRequest(reason="missing"),
+            IndexJobCancelRequest(reason="missing"),
         )
 
     assert exc_info.value.status_code == 404
     assert "not found" in str(exc_info.value.detail)
 
 
-@pytest.mark.asyncio
 async def test_index_job_cancel_returns_404_when_job_not_found_case_insensitive(
-    monkeypatch: pytest.MonkeyPatch,
+    runtime_override,
 ) -> None:
     class _CaseInsensitiveNotFoundWorker:
         async def cancel_job(self, *, job_id: str, reason: str) -> Dict[str, Any]:
@@ -326,88 +473,71 @@ async def test_index_job_cancel_returns_404_when_job_not_found_case_insensitive(
             _ = reason
             return {"ok": False, "error": "Job Not Found"}
 
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state,
-        "index_worker",
-        _CaseInsensitiveNotFoundWorker(),
+    runtime_override(
+        ensure_started=_noop_ensure_started,
+        index_worker=_CaseInsensitiveNotFoundWorker(),
     )
 
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.cancel_index_job(
+    with pytest.raises(HTTPException) as exc_info:
+        await cancel_index_job(
             "idx-missing",
-            maintenance_api.IndexJobCancelRequest(reason="missing"),
+            IndexJobCancelRequest(reason="missing"),
         )
 
     assert exc_info.value.status_code == 404
     assert str(exc_info.value.detail) == "Job Not Found"
 
 
-@pytest.mark.asyncio
 async def test_index_job_cancel_returns_409_when_job_already_finalized(
-    monkeypatch: pytest.MonkeyPatch,
+    worker_client,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
-
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
+    worker, client = worker_client
 
     first = await worker.enqueue_reindex_memory(memory_id=1, reason="week7-finalized-first")
     second = await worker.enqueue_reindex_memory(memory_id=2, reason="week7-finalized-second")
-    await _wait_for_job_status(worker, job_id=first["job_id"], expected_status="running")
-    await _wait_for_job_status(worker, job_id=second["job_id"], expected_status="queued")
-    await maintenance_api.cancel_index_job(
+    await _wait_for_job_statuses(
+        worker,
+        (first["job_id"], "running"),
+        (second["job_id"], "queued"),
+    )
+    await cancel_index_job(
         second["job_id"],
-        maintenance_api.IndexJobCancelRequest(reason="first-cancel"),
+        IndexJobCancelRequest(reason="first-cancel"),
     )
 
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.cancel_index_job(
+    with pytest.raises(HTTPException) as exc_info:
+        await cancel_index_job(
             second["job_id"],
-            maintenance_api.IndexJobCancelRequest(reason="second-cancel"),
+            IndexJobCancelRequest(reason="second-cancel"),
         )
 
+    client.release_slow()
     await worker.wait_for_job(job_id=first["job_id"], timeout_seconds=2.0)
-    await worker.shutdown()
 
     assert exc_info.value.status_code == 409
     assert str(exc_info.value.detail) == "job_already_finalized"
 
 
-@pytest.mark.asyncio
 async def test_index_job_retry_requeues_cancelled_reindex_job(
-    monkeypatch: pytest.MonkeyPatch,
+    worker_client,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
-
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
+    worker, client = worker_client
 
     first = await worker.enqueue_reindex_memory(memory_id=1, reason="week7-retry-first")
     second = await worker.enqueue_reindex_memory(memory_id=2, reason="week7-retry-second")
-    await _wait_for_job_status(worker, job_id=first["job_id"], expected_status="running")
-    await _wait_for_job_status(worker, job_id=second["job_id"], expected_status="queued")
+    await _wait_for_job_statuses(
+        worker,
+        (first["job_id"], "running"),
+        (second["job_id"], "queued"),
+    )
 
-    await maintenance_api.cancel_index_job(
+    await cancel_index_job(
         second["job_id"],
-        maintenance_api.IndexJobCancelRequest(reason="retry-prep"),
+        IndexJobCancelRequest(reason="retry-prep"),
     )
-    retry_payload = await maintenance_api.retry_index_job(
+    retry_payload = await retry_index_job(
         second["job_id"],
-        maintenance_api.IndexJobRetryRequest(reason="retry-via-api"),
+        IndexJobRetryRequest(reason="retry-via-api"),
     )
 
     retry_job_id = str(retry_payload.get("job_id") or "")
@@ -418,9 +548,9 @@ async def test_index_job_retry_requeues_cancelled_reindex_job(
     assert retry_payload["queued"] is True
     assert retry_job_id
 
+    client.release_slow()
     wait_retry = await worker.wait_for_job(job_id=retry_job_id, timeout_seconds=2.0)
     wait_first = await worker.wait_for_job(job_id=first["job_id"], timeout_seconds=2.0)
-    await worker.shutdown()
 
     assert wait_retry["ok"] is True
     assert wait_retry["job"]["status"] == "succeeded"
@@ -428,47 +558,27 @@ async def test_index_job_retry_requeues_cancelled_reindex_job(
     assert client.reindex_calls == [(1, "week7-retry-first"), (2, "retry-via-api")]
 
 
-@pytest.mark.asyncio
-async def test_index_job_retry_returns_404_when_job_not_found(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    worker = IndexTaskWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job("idx-missing")
+async def test_index_job_retry_returns_404_when_job_not_found() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        await retry_index_job("idx-missing")
 
     assert exc_info.value.status_code == 404
     assert "not found" in str(exc_info.value.detail)
 
 
-@pytest.mark.asyncio
 async def test_index_job_retry_returns_409_when_job_status_is_not_retryable(
-    monkeypatch: pytest.MonkeyPatch,
+    worker_client,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
-
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
+    worker, client = worker_client
 
     enqueue_result = await worker.enqueue_reindex_memory(memory_id=1, reason="week7-retry-running")
-    await _wait_for_job_status(worker, job_id=enqueue_result["job_id"], expected_status="running")
+    await _wait_for_job_statuses(worker, (enqueue_result["job_id"], "running"))
 
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job(enqueue_result["job_id"])
+    with pytest.raises(HTTPException) as exc_info:
+        await retry_index_job(enqueue_result["job_id"])
 
+    client.release_slow()
     await worker.wait_for_job(job_id=enqueue_result["job_id"], timeout_seconds=2.0)
-    await worker.shutdown()
 
     assert exc_info.value.status_code == 409
     detail = exc_info.value.detail or {}
@@ -476,184 +586,90 @@ async def test_index_job_retry_returns_409_when_job_status_is_not_retryable(
     assert detail["reason"] == "status:running"
 
 
-@pytest.mark.asyncio
-async def test_index_job_retry_returns_503_when_enqueue_is_queue_full(
-    monkeypatch: pytest.MonkeyPatch,
+_RETRY_ERROR_CASES = [
+    pytest.param(
+        "idx-failed-rebuild",
+        None,
+        None,
+        503,
+        {
+            "error": "index_job_enqueue_failed",
+            "reason": "queue_full",
+            "operation": "retry_rebuild_index",
+        },
+        id="rebuild-queue-full",
+    ),
+    pytest.param(
+        "idx-sleep-failed",
+        {"task_type": "sleep_consolidation", "status": "failed"},
+        _NOT_SCHEDULED_SLEEP_COORDINATOR,
+        409,
+        {"error": "job_retry_not_scheduled", "reason": "sleep_disabled"},
+        id="sleep-not-scheduled",
+    ),
+    pytest.param(
+        "idx-unsupported",
+        {"task_type": "unknown_task", "status": "failed"},
+        None,
+        409,
+        {"error": "job_retry_unsupported_task_type", "task_type": "unknown_task"},
+        id="unsupported-task-type",
+    ),
+    pytest.param(
+        "idx-reindex-invalid",
+        {"task_type": "reindex_memory", "status": "failed", "memory_id": 0},
+        None,
+        409,
+        {"error": "job_retry_invalid_memory_id", "task_type": "reindex_memory"},
+        id="invalid-memory-id",
+    ),
+    pytest.param(
+        "idx-retry-sleep",
+        {"task_type": "sleep_consolidation", "status": "failed"},
+        _QUEUE_FULL_SLEEP_COORDINATOR,
+        503,
+        {
+            "error": "index_job_enqueue_failed",
+            "reason": "queue_full",
+            "operation": "retry_sleep_consolidation",
+        },
+        id="sleep-queue-full",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "job_id,stub_job,coordinator,expected_status,expected_detail",
+    _RETRY_ERROR_CASES,
+)
+async def test_index_job_retry_error_matrix(
+    queue_full_runtime,
+    job_id: str,
+    stub_job: Dict[str, Any] | None,
+    coordinator: Any,
+    expected_status: int,
+    expected_detail: Dict[str, Any],
 ) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job(
-            "idx-failed-rebuild",
-            maintenance_api.IndexJobRetryRequest(reason="retry-week7-queue-full"),
+    if stub_job is not None:
+        _QUEUE_FULL_INDEX_WORKER._responses[job_id] = _frozen_job_response(
+            {"job_id": job_id, **stub_job}
         )
+    if coordinator is not None:
+        queue_full_runtime(sleep_consolidation=coordinator)
 
-    assert exc_info.value.status_code == 503
-    detail = exc_info.value.detail or {}
-    assert detail["error"] == "index_job_enqueue_failed"
-    assert detail["reason"] == "queue_full"
-    assert detail["operation"] == "retry_rebuild_index"
+    with pytest.raises(HTTPException) as exc_info:
+        await retry_index_job(job_id)
 
-
-@pytest.mark.asyncio
-async def test_index_job_retry_returns_409_when_sleep_consolidation_not_scheduled(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    async def _get_job(*, job_id: str) -> Dict[str, Any]:
-        _ = job_id
-        return {
-            "ok": True,
-            "job": {
-                "job_id": "idx-sleep-failed",
-                "task_type": "sleep_consolidation",
-                "status": "failed",
-            },
-        }
-
-    class _NotScheduledSleepCoordinator:
-        async def schedule(self, *, index_worker, force: bool = False, reason: str = "runtime") -> Dict[str, Any]:
-            _ = index_worker
-            _ = force
-            _ = reason
-            return {"scheduled": False, "reason": "sleep_disabled"}
-
-    monkeypatch.setattr(worker, "get_job", _get_job)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(
-        maintenance_api.runtime_state,
-        "sleep_consolidation",
-        _NotScheduledSleepCoordinator(),
-    )
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job("idx-sleep-failed")
-
-    assert exc_info.value.status_code == 409
-    detail = exc_info.value.detail or {}
-    assert detail["error"] == "job_retry_not_scheduled"
-    assert detail["reason"] == "sleep_disabled"
-
-
-@pytest.mark.asyncio
-async def test_index_job_retry_returns_409_for_unsupported_task_type(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    async def _get_job(*, job_id: str) -> Dict[str, Any]:
-        _ = job_id
-        return {
-            "ok": True,
-            "job": {
-                "job_id": "idx-unsupported",
-                "task_type": "unknown_task",
-                "status": "failed",
-            },
-        }
-
-    monkeypatch.setattr(worker, "get_job", _get_job)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job("idx-unsupported")
-
-    assert exc_info.value.status_code == 409
-    detail = exc_info.value.detail or {}
-    assert detail["error"] == "job_retry_unsupported_task_type"
-    assert detail["task_type"] == "unknown_task"
-
-
-@pytest.mark.asyncio
-async def test_index_job_retry_returns_409_when_memory_id_is_invalid(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    async def _get_job(*, job_id: str) -> Dict[str, Any]:
-        _ = job_id
-        return {
-            "ok": True,
-            "job": {
-                "job_id": "idx-reindex-invalid",
-                "task_type": "reindex_memory",
-                "status": "failed",
-                "memory_id": 0,
-            },
-        }
-
-    monkeypatch.setattr(worker, "get_job", _get_job)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job("idx-reindex-invalid")
-
-    assert exc_info.value.status_code == 409
+    assert exc_info.value.status_code == expected_status
     detail = exc_info.value.detail or {}
-    assert detail["error"] == "job_retry_invalid_memory_id"
-    assert detail["task_type"] == "reindex_memory"
+    for key, value in expected_detail.items():
+        assert detail[key] == value
 
 
-@pytest.mark.asyncio
-async def test_index_job_retry_sleep_consolidation_returns_503_when_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+async def test_reindex_job_forwards_reason_to_client(
+    worker_client,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-    coordinator = _QueueFullSleepCoordinator()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    async def _get_job(*, job_id: str) -> Dict[str, Any]:
-        _ = job_id
-        return {
-            "ok": True,
-            "job": {
-                "job_id": "idx-retry-sleep",
-                "task_type": "sleep_consolidation",
-                "status": "failed",
-            },
-        }
-
-    monkeypatch.setattr(worker, "get_job", _get_job)
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(maintenance_api.runtime_state, "sleep_consolidation", coordinator)
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.retry_index_job("idx-retry-sleep")
-
-    assert exc_info.value.status_code == 503
-    detail = exc_info.value.detail or {}
-    assert detail["error"] == "index_job_enqueue_failed"
-    assert detail["reason"] == "queue_full"
-    assert detail["operation"] == "retry_sleep_consolidation"
-
-
-@pytest.mark.asyncio
-async def test_reindex_job_forwards_reason_to_client() -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
+    worker, client = worker_client
 
     enqueue_result = await worker.enqueue_reindex_memory(
         memory_id=2,
@@ -663,7 +679,6 @@ async def test_reindex_job_forwards_reason_to_client() -> None:
         job_id=enqueue_result["job_id"],
         timeout_seconds=2.0,
     )
-    await worker.shutdown()
 
     assert wait_result["ok"] is True
     assert wait_result["job"]["status"] == "succeeded"
@@ -671,81 +686,66 @@ async def test_reindex_job_forwards_reason_to_client() -> None:
     assert client.reindex_calls == [(2, "week7-reason-forward")]
 
 
-@pytest.mark.asyncio
-async def test_sleep_consolidation_job_executes_preview_and_rebuild(
+@pytest.mark.parametrize(
+    "apply_enabled",
+    [
+        pytest.param(True, id="apply"),
+        pytest.param(False, id="preview-only-default"),
+    ],
+)
+async def test_sleep_consolidation_job_runs_dedup_rollup_and_rebuild(
     monkeypatch: pytest.MonkeyPatch,
+    worker_client,
+    apply_enabled: bool,
 ) -> None:
-    monkeypatch.setenv("RUNTIME_SLEEP_DEDUP_APPLY", "1")
-    monkeypatch.setenv("RUNTIME_SLEEP_FRAGMENT_ROLLUP_APPLY", "1")
+    for env_name in ("RUNTIME_SLEEP_DEDUP_APPLY", "RUNTIME_SLEEP_FRAGMENT_ROLLUP_APPLY"):
+        if apply_enabled:
+            monkeypatch.setenv(env_name, "1")
+        else:
+            monkeypatch.delenv(env_name, raising=False)
 
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
+    worker, client = worker_client
 
     enqueue_result = await worker.enqueue_sleep_consolidation(reason="nightly")
     wait_result = await worker.wait_for_job(
         job_id=enqueue_result["job_id"],
         timeout_seconds=2.0,
     )
-    await worker.shutdown()
 
     assert enqueue_result["queued"] is True
     assert wait_result["ok"] is True
     assert wait_result["job"]["status"] == "succeeded"
     result = wait_result["job"]["result"]
     assert result["task"] == "sleep_consolidation"
-    assert result["policy"]["dedup_apply_enabled"] is True
-    assert result["policy"]["fragment_rollup_apply_enabled"] is True
+    assert result["policy"]["dedup_apply_enabled"] is apply_enabled
+    assert result["policy"]["fragment_rollup_apply_enabled"] is apply_enabled
     assert result["orphans"]["deprecated"] == 2
     assert result["orphans"]["orphaned"] == 1
-    assert result["dedup"]["duplicate_groups"] == 1
-    assert result["dedup"]["preview_only"] is False
-    assert result["dedup"]["deleted_duplicates"] == 1
-    assert result["dedup"]["deleted_memory_ids"] == [3]
-    assert client.deleted_memory_ids == [3]
     assert result["cleanup_preview"]["candidate_count"] == 2
-    assert result["fragment_rollup"]["preview_only"] is False
+    assert result["dedup"]["duplicate_groups"] == 1
+    assert result["dedup"]["preview_only"] is not apply_enabled
+    assert result["fragment_rollup"]["preview_only"] is not apply_enabled
     assert result["fragment_rollup"]["preview_groups"] == 1
-    assert result["fragment_rollup"]["groups_aggregated"] == 1
-    assert result["fragment_rollup"]["gist_upserts"] == 1
-    assert result["fragment_rollup"]["memory_coverage"] == 3
-    assert client.gist_upserts
-    assert client.gist_upserts[0]["gist_method"] == "sleep_fragment_rollup"
     assert result["rebuild_result"]["ok"] is True
     assert any(call.startswith("sleep_consolidation:") for call in client.rebuild_calls)
 
-
-@pytest.mark.asyncio
-async def test_sleep_consolidation_defaults_to_preview_only_when_apply_flags_disabled() -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    await worker.ensure_started(lambda: client)
-
-    enqueue_result = await worker.enqueue_sleep_consolidation(reason="preview-default")
-    wait_result = await worker.wait_for_job(
-        job_id=enqueue_result["job_id"],
-        timeout_seconds=2.0,
-    )
-    await worker.shutdown()
-
-    assert wait_result["ok"] is True
-    assert wait_result["job"]["status"] == "succeeded"
-    result = wait_result["job"]["result"]
-    assert result["policy"]["dedup_apply_enabled"] is False
-    assert result["policy"]["fragment_rollup_apply_enabled"] is False
-    assert result["dedup"]["preview_only"] is True
-    assert result["dedup"]["duplicate_groups"] == 1
-    assert result["dedup"]["deleted_duplicates"] == 0
-    assert client.deleted_memory_ids == []
-    assert result["fragment_rollup"]["preview_only"] is True
-    assert result["fragment_rollup"]["preview_groups"] == 1
-    assert result["fragment_rollup"]["groups_aggregated"] == 0
-    assert result["fragment_rollup"]["gist_upserts"] == 0
-    assert client.gist_upserts == []
-    assert result["rebuild_result"]["ok"] is True
+    if apply_enabled:
+        assert result["dedup"]["deleted_duplicates"] == 1
+        assert result["dedup"]["deleted_memory_ids"] == [3]
+        assert client.deleted_memory_ids == [3]
+        assert result["fragment_rollup"]["groups_aggregated"] == 1
+        assert result["fragment_rollup"]["gist_upserts"] == 1
+        assert result["fragment_rollup"]["memory_coverage"] == 3
+        assert client.gist_upserts
+        assert client.gist_upserts[0]["gist_method"] == "sleep_fragment_rollup"
+    else:
+        assert result["dedup"]["deleted_duplicates"] == 0
+        assert client.deleted_memory_ids == []
+        assert result["fragment_rollup"]["groups_aggregated"] == 0
+        assert result["fragment_rollup"]["gist_upserts"] == 0
+        assert client.gist_upserts == []
 
 
-@pytest.mark.asyncio
 async def test_sleep_consolidation_uses_short_retry_after_queue_full() -> None:
     class _QueueFullThenRecoverWorker:
         def __init__(self) -> None:
@@ -767,8 +767,16 @@ async def test_sleep_consolidation_uses_short_retry_after_queue_full() -> None:
                 "reason": "runtime",
             }
 
+    class _FakeClock:
+        def __init__(self) -> None:
+            self.now = 1_000.0
+
+        def __call__(self) -> float:
+            return self.now
+
     worker = _QueueFullThenRecoverWorker()
-    coordinator = SleepTimeConsolidator()
+    clock = _FakeClock()
+    coordinator = SleepTimeConsolidator(time_source=clock)
 
     first_result = await coordinator.schedule(
         index_worker=worker,
@@ -781,7 +789,7 @@ async def test_sleep_consolidation_uses_short_retry_after_queue_full() -> None:
         reason="runtime.ensure_started",
     )
 
-    coordinator._last_check_ts -= SleepTimeConsolidator._QUEUE_FULL_RETRY_SECONDS + 0.1
+    clock.now += SleepTimeConsolidator._QUEUE_FULL_RETRY_SECONDS + 0.1
     third_result = await coordinator.schedule(
         index_worker=worker,
         force=False,
@@ -802,23 +810,21 @@ async def test_sleep_consolidation_uses_short_retry_after_queue_full() -> None:
     assert third_result["retry_after_seconds"] == float(coordinator._check_interval_seconds)
 
 
-@pytest.mark.asyncio
 async def test_sleep_consolidation_degrades_when_dedup_or_rollup_methods_unavailable(
     monkeypatch: pytest.MonkeyPatch,
+    use_worker_client,
 ) -> None:
     monkeypatch.setenv("RUNTIME_SLEEP_DEDUP_APPLY", "1")
     monkeypatch.setenv("RUNTIME_SLEEP_FRAGMENT_ROLLUP_APPLY", "1")
 
-    worker = IndexTaskWorker()
     client = _SleepPreviewOnlyClient()
-    await worker.ensure_started(lambda: client)
+    worker = await use_worker_client(client)
 
     enqueue_result = await worker.enqueue_sleep_consolidation(reason="preview-only")
     wait_result = await worker.wait_for_job(
         job_id=enqueue_result["job_id"],
         timeout_seconds=2.0,
     )
-    await worker.shutdown()
 
     assert wait_result["ok"] is True
     assert wait_result["job"]["status"] == "succeeded"
@@ -830,70 +836,91 @@ async def test_sleep_consolidation_degrades_when_dedup_or_rollup_methods_unavail
     assert client.rebuild_calls
 
 
-@pytest.mark.asyncio
+def _sqlite_test_url(tmp_path, name: str) -> str:
+    # MP_TEST_SQLITE_MEMORY=1 keeps functional sqlite tests off the disk (see
+    # AGENTS.md; CI runs this module once with it set). The engine pins a
+    # single connection for :memory: so the worker sees the same data.
+    toggle = os.getenv("MP_TEST_SQLITE_MEMORY", "").strip().lower()
+    if toggle in {"1", "true", "yes", "on"}:
+        return "sqlite+aiosqlite:///:memory:"
+    return f"sqlite+aiosqlite:///{tmp_path / name}"
+
+
+def _use_fast_sqlite_pragmas(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Short-lived test databases do not need rollback-journal durability; the
+    # runtime write pragmas give one fsync per commit and no checkpoint stalls.
+    monkeypatch.setenv("RUNTIME_WRITE_WAL_ENABLED", "true")
+    monkeypatch.setenv("RUNTIME_WRITE_JOURNAL_MODE", "wal")
+    monkeypatch.setenv("RUNTIME_WRITE_WAL_SYNCHRONOUS", "normal")
+    monkeypatch.setenv("RUNTIME_WRITE_WAL_AUTOCHECKPOINT", "4000")
+
+
 async def test_sleep_consolidation_does_not_overwrite_existing_non_rollup_gist_sqlite(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path,
+    use_worker_client,
 ) -> None:
     monkeypatch.setenv("RUNTIME_SLEEP_FRAGMENT_ROLLUP_APPLY", "1")
     monkeypatch.setenv("RUNTIME_SLEEP_DEDUP_APPLY", "0")
+    _use_fast_sqlite_pragmas(monkeypatch)
 
     from db.sqlite_client import SQLiteClient
 
-    db_path = tmp_path / "week7-sleep-rollup.db"
-    client = SQLiteClient(f"sqlite+aiosqlite:///{db_path}")
+    client = SQLiteClient(_sqlite_test_url(tmp_path, "week7-sleep-rollup.db"))
     await client.init_db()
+    try:
+        await client.create_memories_bulk(
+            [
+                {
+                    "parent_path": "",
+                    "content": "Projects root node",
+                    "priority": 1,
+                    "title": "projects",
+                    "domain": "core",
+                },
+                {
+                    "parent_path": "projects",
+                    "content": "Alpha shard one",
+                    "priority": 1,
+                    "title": "a1",
+                    "domain": "core",
+                },
+                {
+                    "parent_path": "projects",
+                    "content": "Alpha shard two",
+                    "priority": 1,
+                    "title": "a2",
+                    "domain": "core",
+                },
+                {
+                    "parent_path": "projects",
+                    "content": "Alpha shard three",
+                    "priority": 1,
+                    "title": "a3",
+                    "domain": "core",
+                },
+            ]
+        )
 
-    await client.create_memory(
-        parent_path="",
-        content="Projects root node",
-        priority=1,
-        title="projects",
-        domain="core",
-    )
-    await client.create_memory(
-        parent_path="projects",
-        content="Alpha shard one",
-        priority=1,
-        title="a1",
-        domain="core",
-    )
-    await client.create_memory(
-        parent_path="projects",
-        content="Alpha shard two",
-        priority=1,
-        title="a2",
-        domain="core",
-    )
-    await client.create_memory(
-        parent_path="projects",
-        content="Alpha shard three",
-        priority=1,
-        title="a3",
-        domain="core",
-    )
-
-    recent = await client.get_recent_memories(limit=20)
-    project_children = [
-        item
-        for item in recent
-        if isinstance(item, dict)
-        and str(item.get("uri") or "").startswith("core://projects/")
-    ]
-    assert len(project_children) >= 3
-    anchor_memory_id = int(project_children[0]["memory_id"])
-
-    existing_gist = await client.upsert_memory_gist(
-        memory_id=anchor_memory_id,
-        gist_text="existing canonical gist",
-        source_hash="existing-canonical-hash",
-        gist_method="extractive_bullets",
-        quality_score=0.77,
-    )
+        recent = await client.get_recent_memories(limit=20)
+        project_children = [
+            item
+            for item in recent
+            if isinstance(item, dict)
+            and str(item.get("uri") or "").startswith("core://projects/")
+        ]
+        assert len(project_children) >= 3
+        anchor_memory_id = int(project_children[0]["memory_id"])
+
+        existing_gist = await client.upsert_memory_gist(
+            memory_id=anchor_memory_id,
+            gist_text="existing canonical gist",
+            source_hash="existing-canonical-hash",
+            gist_method="extractive_bullets",
+            quality_score=0.77,
+        )
 
-    worker = IndexTaskWorker()
-    await worker.ensure_started(lambda: client)
-    try:
+        worker = await use_worker_client(client)
         enqueue_result = await worker.enqueue_sleep_consolidation(reason="sqlite-guard")
         wait_result = await worker.wait_for_job(
             job_id=enqueue_result["job_id"],
@@ -908,59 +935,161 @@ async def test_sleep_consolidation_does_not_overwrite_existing_non_rollup_gist_s
         assert result["fragment_rollup"]["groups_aggregated"] == 0
         assert result["fragment_rollup"]["gist_upserts"] == 0
         assert result["rebuild_result"]["reason"].startswith("sleep_consolidation:")
+
+        latest_gist = await client.get_latest_memory_gist(anchor_memory_id)
+
+        assert latest_gist is not None
+        assert latest_gist["gist_method"] == "extractive_bullets"
+        assert latest_gist["gist_text"] == "existing canonical gist"
+        assert latest_gist["source_hash"] == "existing-canonical-hash"
+        assert latest_gist["id"] == existing_gist["id"]
     finally:
-        await worker.shutdown()
+        await client.close()
 
-    latest_gist = await client.get_latest_memory_gist(anchor_memory_id)
-    await client.close()
 
-    assert latest_gist is not None
-    assert latest_gist["gist_method"] == "extractive_bullets"
-    assert latest_gist["gist_text"] == "existing canonical gist"
-    assert latest_gist["source_hash"] == "existing-canonical-hash"
-    assert latest_gist["id"] == existing_gist["id"]
+async def test_create_memories_bulk_rolls_back_whole_batch_on_failure(
+    tmp_path,
+) -> None:
+    from db.sqlite_client import SQLiteClient
 
+    client = SQLiteClient(_sqlite_test_url(tmp_path, "week7-bulk.db"))
+    await client.init_db()
+    try:
+        with pytest.raises(ValueError, match="does not exist"):
+            await client.create_memories_bulk(
+                [
+                    {
+                        "parent_path": "",
+                        "content": "Projects root node",
+                        "priority": 1,
+                        "title": "projects",
+                    },
+                    {
+                        "parent_path": "missing",
+                        "content": "Orphan shard",
+                        "priority": 1,
+                        "title": "x1",
+                    },
+                ]
+            )
+        assert await client.get_recent_memories(limit=20) == []
+    finally:
+        await client.close()
+
+
+@pytest.mark.parametrize(
+    "entry,message",
+    [
+        (
+            {"parent_path": "", "content": "x", "priority": 1, "known_paths": set()},
+            "unsupported keys: known_paths",
+        ),
+        ({"parent_path": "", "priority": 1}, "missing keys: content"),
+    ],
+    ids=["unknown-key", "missing-key"],
+)
+async def test_create_memories_bulk_rejects_bad_entries_before_writing(
+    tmp_path,
+    entry: Dict[str, Any],
+    message: str,
+) -> None:
+    from db.sqlite_client import SQLiteClient
 
-@pytest.mark.asyncio
-async def test_sleep_consolidation_job_fails_when_rebuild_index_raises() -> None:
-    worker = IndexTaskWorker()
+    client = SQLiteClient(_sqlite_test_url(tmp_path, "week7-bulk-invalid.db"))
+    await client.init_db()
+    try:
+        with pytest.raises(ValueError, match=message):
+            await client.create_memories_bulk(
+                [
+                    {
+                        "parent_path": "",
+                        "content": "Valid first entry",
+                        "priority": 1,
+                        "title": "first",
+                    },
+                    entry,
+                ]
+            )
+        assert await client.get_recent_memories(limit=20) == []
+    finally:
+        await client.close()
+
+
+async def test_sleep_consolidation_job_fails_when_rebuild_index_raises(
+    use_worker_client,
+) -> None:
     client = _FailingSleepRebuildClient()
-    await worker.ensure_started(lambda: client)
+    worker = await use_worker_client(client)
 
     enqueue_result = await worker.enqueue_sleep_consolidation(reason="sleep-fail")
     wait_result = await worker.wait_for_job(
         job_id=enqueue_result["job_id"],
         timeout_seconds=2.0,
     )
-    await worker.shutdown()
 
     assert wait_result["ok"] is True
     assert wait_result["job"]["status"] == "failed"
     assert wait_result["job"]["error"] == "sleep_rebuild_failed"
 
 
-@pytest.mark.asyncio
+async def test_sleep_consolidation_reads_orphan_versions_concurrently(
+    use_worker_client,
+) -> None:
+    client = _ConcurrentReadProbeClient()
+    worker = await use_worker_client(client)
+
+    enqueue_result = await worker.enqueue_sleep_consolidation(reason="concurrent-reads")
+    wait_result = await worker.wait_for_job(
+        job_id=enqueue_result["job_id"],
+        timeout_seconds=2.0,
+    )
+
+    assert wait_result["job"]["status"] == "succeeded"
+    result = wait_result["job"]["result"]
+    assert client.max_in_flight == 3
+    assert result["dedup"]["scanned_orphans"] == 2
+    assert result["dedup"]["duplicate_groups"] == 1
+    assert result["dedup"]["errors"] == [
+        {"memory_id": 2, "error": "memory_id=2 unreadable"}
+    ]
+
+
+async def test_sleep_consolidation_bounds_concurrent_orphan_reads(
+    use_worker_client,
+) -> None:
+    class _ManyOrphansClient(_ConcurrentReadProbeClient):
+        async def get_all_orphan_memories(self) -> list[Dict[str, Any]]:
+            return [{"id": memory_id, "category": "deprecated"} for memory_id in range(1, 21)]
+
+    client = _ManyOrphansClient()
+    worker = await use_worker_client(client)
+
+    enqueue_result = await worker.enqueue_sleep_consolidation(reason="bounded-reads")
+    wait_result = await worker.wait_for_job(
+        job_id=enqueue_result["job_id"],
+        timeout_seconds=2.0,
+    )
+
+    assert wait_result["job"]["status"] == "succeeded"
+    assert client.max_in_flight == IndexTaskWorker._SLEEP_READ_CONCURRENCY
+    # id 2 is unreadable and ids 4..20 have no stored version.
+    assert len(wait_result["job"]["result"]["dedup"]["errors"]) == 18
+
+
 async def test_maintenance_trigger_sleep_consolidation_returns_wait_result(
-    monkeypatch: pytest.MonkeyPatch,
+    runtime_override,
+    worker_client,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
+    _worker, client = worker_client
     coordinator = SleepTimeConsolidator()
-    await worker.ensure_started(lambda: client)
 
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
+    runtime_override(sleep_consolidation=coordinator)
 
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(maintenance_api.runtime_state, "sleep_consolidation", coordinator)
-
-    payload = await maintenance_api.trigger_sleep_consolidation(
+    payload = await trigger_sleep_consolidation(
         reason="ops_console",
         wait=True,
         timeout_seconds=2,
     )
-    await worker.shutdown()
 
     assert payload["ok"] is True
     assert payload["reason"] == "ops_console"
@@ -970,20 +1099,10 @@ async def test_maintenance_trigger_sleep_consolidation_returns_wait_result(
     assert payload["sleep_consolidation"]["enabled"] in {True, False}
 
 
-@pytest.mark.asyncio
 async def test_maintenance_reindex_returns_503_when_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: _FakeIndexClient())
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
+    with pytest.raises(HTTPException) as exc_info:
         await maintenance_api.reindex_memory(memory_id=7, reason="week7-queue-full")
 
     assert exc_info.value.status_code == 503
@@ -993,20 +1112,10 @@ async def test_maintenance_reindex_returns_503_when_queue_is_full(
     assert detail["operation"] == "reindex_memory"
 
 
-@pytest.mark.asyncio
 async def test_maintenance_rebuild_returns_503_when_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(maintenance_api, "get_sqlite_client", lambda: _FakeIndexClient())
-
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
+    with pytest.raises(HTTPException) as exc_info:
         await maintenance_api.rebuild_index(reason="week7-queue-full")
 
     assert exc_info.value.status_code == 503
@@ -1016,22 +1125,13 @@ async def test_maintenance_rebuild_returns_503_when_queue_is_full(
     assert detail["operation"] == "rebuild_index"
 
 
-@pytest.mark.asyncio
 async def test_maintenance_sleep_consolidation_returns_503_when_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-    coordinator = _QueueFullSleepCoordinator()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(maintenance_api.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(maintenance_api.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(maintenance_api.runtime_state, "sleep_consolidation", coordinator)
+    queue_full_runtime(sleep_consolidation=_QUEUE_FULL_SLEEP_COORDINATOR)
 
-    with pytest.raises(maintenance_api.HTTPException) as exc_info:
-        await maintenance_api.trigger_sleep_consolidation(reason="week7-sleep-queue-full")
+    with pytest.raises(HTTPException) as exc_info:
+        await trigger_sleep_consolidation(reason="week7-sleep-queue-full")
 
     assert exc_info.value.status_code == 503
     detail = exc_info.value.detail or {}
@@ -1040,31 +1140,17 @@ async def test_maintenance_sleep_consolidation_returns_503_when_queue_is_full(
     assert detail["operation"] == "sleep_consolidation"
 
 
-@pytest.mark.asyncio
 async def test_mcp_rebuild_index_supports_sleep_consolidation_mode(
-    monkeypatch: pytest.MonkeyPatch,
+    runtime_override,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    coordinator = SleepTimeConsolidator()
-    await worker.ensure_started(lambda: client)
+    runtime_override(sleep_consolidation=SleepTimeConsolidator())
 
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(mcp_server, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(mcp_server.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(mcp_server.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(mcp_server.runtime_state, "sleep_consolidation", coordinator)
-
-    raw = await mcp_server.rebuild_index(
+    payload = await _mcp_rebuild_index(
         reason="mcp_week7",
         wait=True,
         timeout_seconds=2,
         sleep_consolidation=True,
     )
-    payload = json.loads(raw)
-    await worker.shutdown()
 
     assert payload["ok"] is True
     assert payload["task_type"] == "sleep_consolidation"
@@ -1073,46 +1159,21 @@ async def test_mcp_rebuild_index_supports_sleep_consolidation_mode(
     assert payload["sleep_consolidation"]["enabled"] in {True, False}
 
 
-@pytest.mark.asyncio
 async def test_mcp_rebuild_index_rejects_sleep_consolidation_with_memory_id(
-    monkeypatch: pytest.MonkeyPatch,
+    runtime_override,
 ) -> None:
-    worker = IndexTaskWorker()
-    client = _FakeIndexClient()
-    coordinator = SleepTimeConsolidator()
-    await worker.ensure_started(lambda: client)
+    runtime_override(sleep_consolidation=SleepTimeConsolidator())
 
-    async def _ensure_started(_factory) -> None:
-        await worker.ensure_started(lambda: client)
-
-    monkeypatch.setattr(mcp_server, "get_sqlite_client", lambda: client)
-    monkeypatch.setattr(mcp_server.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(mcp_server.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(mcp_server.runtime_state, "sleep_consolidation", coordinator)
-
-    raw = await mcp_server.rebuild_index(memory_id=7, sleep_consolidation=True)
-    payload = json.loads(raw)
-    await worker.shutdown()
+    payload = await _mcp_rebuild_index(memory_id=7, sleep_consolidation=True)
 
     assert payload["ok"] is False
     assert "incompatible" in payload["error"]
 
 
-@pytest.mark.asyncio
 async def test_mcp_rebuild_index_returns_error_when_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(mcp_server, "get_sqlite_client", lambda: _FakeIndexClient())
-    monkeypatch.setattr(mcp_server.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(mcp_server.runtime_state, "index_worker", worker)
-
-    raw = await mcp_server.rebuild_index(memory_id=7, reason="week7-queue-full")
-    payload = json.loads(raw)
+    payload = await _mcp_rebuild_index(memory_id=7, reason="week7-queue-full")
 
     assert payload["ok"] is False
     assert payload["error"] == "queue_full"
@@ -1121,21 +1182,10 @@ async def test_mcp_rebuild_index_returns_error_when_queue_is_full(
     assert payload["request_reason"] == "week7-queue-full"
 
 
-@pytest.mark.asyncio
 async def test_mcp_rebuild_index_returns_error_when_rebuild_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(mcp_server, "get_sqlite_client", lambda: _FakeIndexClient())
-    monkeypatch.setattr(mcp_server.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(mcp_server.runtime_state, "index_worker", worker)
-
-    raw = await mcp_server.rebuild_index(reason="week7-rebuild-queue-full")
-    payload = json.loads(raw)
+    payload = await _mcp_rebuild_index(reason="week7-rebuild-queue-full")
 
     assert payload["ok"] is False
     assert payload["error"] == "queue_full"
@@ -1144,26 +1194,15 @@ async def test_mcp_rebuild_index_returns_error_when_rebuild_queue_is_full(
     assert payload["request_reason"] == "week7-rebuild-queue-full"
 
 
-@pytest.mark.asyncio
 async def test_mcp_rebuild_index_sleep_consolidation_returns_error_when_queue_is_full(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-    coordinator = _QueueFullSleepCoordinator()
+    queue_full_runtime(sleep_consolidation=_QUEUE_FULL_SLEEP_COORDINATOR)
 
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(mcp_server, "get_sqlite_client", lambda: _FakeIndexClient())
-    monkeypatch.setattr(mcp_server.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(mcp_server.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(mcp_server.runtime_state, "sleep_consolidation", coordinator)
-
-    raw = await mcp_server.rebuild_index(
+    payload = await _mcp_rebuild_index(
         reason="week7-sleep-queue-full",
         sleep_consolidation=True,
     )
-    payload = json.loads(raw)
 
     assert payload["ok"] is False
     assert payload["error"] == "queue_full"
@@ -1172,41 +1211,149 @@ async def test_mcp_rebuild_index_sleep_consolidation_returns_error_when_queue_is
     assert payload["request_reason"] == "week7-sleep-queue-full"
 
 
-@pytest.mark.asyncio
 async def test_mcp_rebuild_index_sleep_consolidation_returns_error_when_not_scheduled(
-    monkeypatch: pytest.MonkeyPatch,
+    queue_full_runtime,
 ) -> None:
-    worker = _QueueFullIndexWorker()
-
-    class _NotScheduledSleepCoordinator:
-        async def schedule(self, *, index_worker, force: bool = False, reason: str = "runtime") -> Dict[str, Any]:
-            _ = index_worker
-            _ = force
-            _ = reason
-            return {"scheduled": False, "reason": "sleep_disabled"}
-
-        async def status(self) -> Dict[str, Any]:
-            return {"enabled": False, "scheduled": False, "reason": "sleep_disabled"}
+    queue_full_runtime(sleep_consolidation=_NOT_SCHEDULED_SLEEP_COORDINATOR)
 
-    async def _ensure_started(_factory) -> None:
-        return None
-
-    monkeypatch.setattr(mcp_server, "get_sqlite_client", lambda: _FakeIndexClient())
-    monkeypatch.setattr(mcp_server.runtime_state, "ensure_started", _ensure_started)
-    monkeypatch.setattr(mcp_server.runtime_state, "index_worker", worker)
-    monkeypatch.setattr(
-        mcp_server.runtime_state,
-        "sleep_consolidation",
-        _NotScheduledSleepCoordinator(),
-    )
-
-    raw = await mcp_server.rebuild_index(
+    payload = await _mcp_rebuild_index(
         reason="week7-sleep-not-scheduled",
         sleep_consolidation=True,
     )
-    payload = json.loads(raw)
 
     assert payload["ok"] is False
     assert payload["error"] == "sleep_disabled"
     assert payload["task_type"] == "sleep_consolidation"
     assert payload["request_reason"] == "week7-sleep-not-scheduled"
+
+
+@pytest.mark.parametrize(
+    "enqueue_name",
+    ["enqueue_rebuild", "enqueue_sleep_consolidation"],
+)
+async def test_index_worker_dedups_pending_singleton_jobs(enqueue_name: str) -> None:
+    # Never started, so the first job stays queued for the whole test.
+    worker = IndexTaskWorker()
+    enqueue = getattr(worker, enqueue_name)
+
+    first = await enqueue(reason="scheduler-tick-1")
+    second = await enqueue(reason="scheduler-tick-2")
+    status = await worker.status()
+
+    assert first["queued"] is True
+    assert second == {"queued": False, "deduped": True, "job_id": first["job_id"]}
+    assert status["queue_depth"] == 1
+    assert status["stats"]["enqueued"] == 1
+    assert status["stats"]["deduped"] == 1
+
+
+async def test_index_worker_wait_for_statuses_fails_fast_and_cleans_up() -> None:
+    # Never started, so the rebuild job stays queued.
+    worker = IndexTaskWorker()
+    job_id = (await worker.enqueue_rebuild(reason="status-wait"))["job_id"]
+
+    missing = await worker.wait_for_statuses(
+        specs=[(job_id, "queued"), ("idx-typo", "running")]
+    )
+    assert missing == {"ok": False, "error": "job 'idx-typo' not found."}
+    assert "idx-typo" not in worker._status_events
+
+    queued = await worker.wait_for_status(job_id=job_id, status="queued")
+    assert queued["ok"] is True
+    assert queued["job"]["status"] == "queued"
+
+    timed_out = await worker.wait_for_status(
+        job_id=job_id, status="running", timeout_seconds=0.01
+    )
+    assert timed_out["ok"] is False
+    assert timed_out["job"]["status"] == "queued"
+    assert worker._status_events == {}
+    assert worker._status_waiters == {}
+
+
+async def test_index_worker_wait_for_status_fails_when_job_skips_status() -> None:
+    # Never started, so the rebuild job is cancelled straight from the queue.
+    worker = IndexTaskWorker()
+    job_id = (await worker.enqueue_rebuild(reason="skip-running"))["job_id"]
+
+    waiting = asyncio.create_task(
+        worker.wait_for_status(job_id=job_id, status="running")
+    )
+    await asyncio.sleep(0)
+    await worker.cancel_job(job_id=job_id, reason="skip")
+    woken = await asyncio.wait_for(waiting, timeout=1.0)
+    late = await worker.wait_for_status(job_id=job_id, status="running")
+
+    expected_error = f"job '{job_id}' finished as 'cancelled' without reaching 'running'."
+    for result in (woken, late):
+        assert result["ok"] is False
+        assert result["error"] == expected_error
+        assert result["job"]["status"] == "cancelled"
+    assert worker._status_events == {}
+    assert worker._status_waiters == {}
+
+
+async def test_index_worker_wait_for_status_sees_statuses_the_job_has_left(
+    worker_client,
+) -> None:
+    worker, _client = worker_client
+
+    enqueue_result = await worker.enqueue_reindex_memory(memory_id=5, reason="history")
+    job_id = enqueue_result["job_id"]
+    await worker.wait_for_job(job_id=job_id, timeout_seconds=2.0)
+
+    for status in ("queued", "running", "succeeded"):
+        result = await worker.wait_for_status(
+            job_id=job_id, status=status, timeout_seconds=0.5
+        )
+        assert result["ok"] is True, status
+        assert result["job"]["status"] == "succeeded"
+    assert worker._reached_statuses[job_id] == {"queued", "running", "succeeded"}
+    assert worker._status_events == {}
+
+
+async def test_index_worker_ensure_started_is_idempotent_per_factory() -> None:
+    worker = IndexTaskWorker()
+    first_client = _FakeIndexClient()
+    second_client = _FakeIndexClient()
+
+    def _first_factory() -> Any:
+        return first_client
+
+    await worker.ensure_started(_first_factory)
+    runner = worker._runner
+    await worker.ensure_started(_first_factory)
+    assert worker._runner is runner
+
+    await worker.ensure_started(lambda: second_client)
+    enqueue_result = await worker.enqueue_reindex_memory(memory_id=2, reason="rebound")
+    wait_result = await worker.wait_for_job(
+        job_id=enqueue_result["job_id"],
+        timeout_seconds=2.0,
+    )
+    await worker.shutdown()
+
+    assert worker._runner is None
+    assert wait_result["job"]["status"] == "succeeded"
+    assert first_client.reindex_calls == []
+    assert second_client.reindex_calls == [(2, "rebound")]
+
+
+async def test_runtime_state_override_restores_components() -> None:
+    runtime = RuntimeState()
+    original_worker = runtime.index_worker
+    replacement_worker = IndexTaskWorker()
+
+    with runtime.override(
+        index_worker=replacement_worker,
+        ensure_started=_noop_ensure_started,
+    ):
+        assert runtime.index_worker is replacement_worker
+        assert runtime.ensure_started is _noop_ensure_started
+
+    assert runtime.index_worker is original_worker
+    assert "ensure_started" not in vars(runtime)
+
+    with pytest.raises(AttributeError):
+        with runtime.override(unknown_component=object()):
+            pass